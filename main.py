@@ -1,5 +1,7 @@
+import sys
 import src.master
 
 
 if __name__ == "__main__":
-    src.master.main()
+    src.master.main(dirty_rects="--dirty-rects" in sys.argv,
+                    max_fps=0 if "--uncapped" in sys.argv else 60)
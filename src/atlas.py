@@ -0,0 +1,96 @@
+import json
+import os
+import pygame
+from src.display import convert_for_display
+
+TEXTURES_DIR = "./assets/textures"
+ATLAS_IMAGE = "./assets/atlas/textures.png"
+ATLAS_INDEX = "./assets/atlas/textures.json"
+ATLAS_WIDTH = 256
+ATLAS_PADDING = 1
+
+_atlas = None
+
+def atlas_key(path):
+    """Index key for a texture path, relative to TEXTURES_DIR and lower-cased so .PNG and .png match"""
+    relative = os.path.relpath(os.path.normpath(path), os.path.normpath(TEXTURES_DIR))
+    return relative.replace(os.sep, "/").lower()
+
+def pack(sizes, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+    """Shelf-packs {key: (w, h)} into rows of the given width, returns ({key: (x, y, w, h)}, height)"""
+    regions = {}
+    x, y, shelf_height = 0, 0, 0
+    # Tallest first keeps the shelves tight
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if w > width:
+            raise ValueError(f"Texture {key} is wider than the atlas ({w} > {width})")
+        if x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        regions[key] = (x, y, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    return regions, y + shelf_height
+
+def build_atlas(textures_dir=TEXTURES_DIR, image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+    """Packs every image under textures_dir into one sheet and writes it with its index"""
+    images = {}
+    for root, _, files in os.walk(textures_dir):
+        for name in sorted(files):
+            if name.lower().endswith(".png"):
+                path = os.path.join(root, name)
+                images[atlas_key(path)] = pygame.image.load(path)
+
+    regions, height = pack({key: image.get_size() for key, image in images.items()})
+
+    sheet = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for key, (x, y, _, _) in regions.items():
+        sheet.blit(images[key], (x, y))
+
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
+    pygame.image.save(sheet, image_path)
+    # One texture per line keeps the generated index readable in diffs
+    entries = ",\n".join(f"  {json.dumps(key)}: {json.dumps(list(region))}"
+                          for key, region in sorted(regions.items()))
+    with open(index_path, "w") as index_file:
+        index_file.write(f'{{"image": {json.dumps(os.path.basename(image_path))}, "textures": {{\n{entries}\n}}}}\n')
+    return regions
+
+def install_atlas(sheet):
+    """Installs an already decoded atlas sheet, converting it for the display
+
+    Does nothing once an atlas is installed, textures already handed out point into that sheet.
+    """
+    global _atlas
+    if _atlas:
+        return
+    with open(ATLAS_INDEX) as index_file:
+        index = json.load(index_file)
+    _atlas = (convert_for_display(sheet), index["textures"])
+
+def load_atlas():
+    """Loads the atlas sheet and index once, returns None when the atlas has not been built"""
+    global _atlas
+    if _atlas is None:
+        if not (os.path.exists(ATLAS_IMAGE) and os.path.exists(ATLAS_INDEX)):
+            _atlas = False
+        else:
+            install_atlas(pygame.image.load(ATLAS_IMAGE))
+    return _atlas or None
+
+def atlas_region(path):
+    """Returns the atlas subsurface for a texture path, or None if it is not packed"""
+    atlas = load_atlas()
+    if atlas is None:
+        return None
+    sheet, textures = atlas
+    region = textures.get(atlas_key(path))
+    if region is None:
+        return None
+    return sheet.subsurface(pygame.Rect(region))
+
+if __name__ == "__main__":
+    packed = build_atlas()
+    print(f"Packed {len(packed)} textures into {ATLAS_IMAGE}")
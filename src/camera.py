@@ -8,8 +8,10 @@ class Camera:
         self.y = 0
         self.target_x = 0
         self.target_y = 0
+        self.prev_x = 0  # Position at the previous simulation step, for render interpolation
+        self.prev_y = 0
 
-        # Simple smoothness factor for 60 FPS
+        # Simple smoothness factor per fixed 60 Hz simulation step
         self.smoothness = 0.1  # Lower = smoother but slower (try 0.05-0.15)
 
     def center_on(self, target_x, target_y, level_width, level_height):
@@ -26,6 +28,14 @@ class Camera:
         self.target_y = max(0, min(desired_y, level_height * TILE_SIZE - self.height))
 
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         # Simple linear interpolation at fixed rate
         self.x += (self.target_x - self.x) * self.smoothness
         self.y += (self.target_y - self.y) * self.smoothness
+
+    def get_position(self, alpha=1.0):
+        """Camera position interpolated between the last two simulation steps"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
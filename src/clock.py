@@ -0,0 +1,48 @@
+import pygame
+
+SIM_STEP_MS = 1000 / 60  # Fixed simulation step, independent of the render rate
+
+class GameClock:
+    """Game time in ms, only advanced by tick() so everything in between reads the same time
+
+    The game loop measures real time with frame_time() and advances game time by fixed
+    simulation steps, so game time is always a whole number of steps in game.
+
+    Modes:
+    - "realtime": frame_time() follows pygame.time.get_ticks()
+    - "scaled": frame_time() is real elapsed time multiplied by scale, for fast-forward or slow motion
+    - "manual": there is no frame time, only the steps passed to tick(), for simulations and tests
+    """
+    MODES = ("realtime", "scaled", "manual")
+
+    def __init__(self, mode="realtime", scale=1.0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown clock mode: {mode}")
+        self.mode = mode
+        self.scale = scale
+        self.now = 0.0
+        self.last_real_time = None
+
+    def frame_time(self):
+        """Real ms since the previous call (times scale in "scaled" mode), 0 on the first call"""
+        if self.mode == "manual":
+            return 0.0
+        real_time = pygame.time.get_ticks()
+        elapsed = 0.0 if self.last_real_time is None else float(real_time - self.last_real_time)
+        self.last_real_time = real_time
+        return elapsed * self.scale if self.mode == "scaled" else elapsed
+
+    def tick(self, step_ms=None):
+        """Advances game time by step_ms, or by frame_time() if omitted, and returns the ms advanced"""
+        if step_ms is None:
+            if self.mode == "manual":
+                raise ValueError("A manual clock needs an explicit step")
+            step_ms = self.frame_time()
+        self.now += step_ms
+        return step_ms
+
+    def get_ticks(self):
+        """Game time of the current tick, in whole ms like pygame.time.get_ticks()"""
+        return int(self.now)
+
+game_clock = GameClock()
@@ -1,10 +1,102 @@
 import pygame
+from collections import OrderedDict
+from src.atlas import atlas_region
+from src.display import convert_for_display
 
 TILE_SIZE = 24
+CHUNK_SIZE = 16  # Side, in tiles, of the square chunks big levels are split into
 PLAYER_SIZE = 16
 TEXTURE_CACHE = {}
+SCALED_TEXTURE_CACHE = {}
+SCALED_TEXTURE_STATS = {"hits": 0, "misses": 0}
+
+SOUND_CACHE = {}
+
+FONT_PATH = "./assets/Micro_Chat.ttf"
+FONT_CACHE = {}
+TEXT_CACHE = OrderedDict()
+TEXT_CACHE_LIMIT = 512
+TEXT_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+def _faded(surface):
+    faded = surface.copy()
+    faded.set_alpha(80)
+    return faded
+
+def _flash(surface):
+    flash = surface.copy()
+    flash.fill((255, 255, 255, 128), None, pygame.BLEND_RGBA_ADD)
+    return flash
+
+# Named post-processing steps applied to a scaled texture before caching
+TEXTURE_VARIANTS = {
+    "faded": _faded,
+    "flash": _flash,
+}
 
 def load_texture(path):
     if path not in TEXTURE_CACHE:
-        TEXTURE_CACHE[path] = pygame.image.load(path).convert_alpha()
+        # Textures packed into the atlas come back as subsurfaces of the shared sheet
+        texture = atlas_region(path)
+        if texture is None:
+            texture = convert_for_display(pygame.image.load(path))
+        TEXTURE_CACHE[path] = texture
     return TEXTURE_CACHE[path]
+
+def load_sound(path):
+    """Returns the shared, decoded Sound for path"""
+    if path not in SOUND_CACHE:
+        SOUND_CACHE[path] = pygame.mixer.Sound(path)
+    return SOUND_CACHE[path]
+
+def load_scaled_texture(path, size, flip_x=False, variant=None):
+    """Returns the texture at path scaled to size, cached per (path, size, flip, variant)"""
+    key = (path, size, flip_x, variant)
+    texture = SCALED_TEXTURE_CACHE.get(key)
+    if texture is not None:
+        SCALED_TEXTURE_STATS["hits"] += 1
+        return texture
+
+    SCALED_TEXTURE_STATS["misses"] += 1
+    texture = load_texture(path)
+    if flip_x:
+        texture = pygame.transform.flip(texture, True, False)
+    texture = pygame.transform.scale(texture, size)
+    if variant is not None:
+        texture = TEXTURE_VARIANTS[variant](texture)
+    SCALED_TEXTURE_CACHE[key] = texture
+    return texture
+
+def get_scaled_texture_stats():
+    """Returns a snapshot of the scaled texture cache hit/miss counters"""
+    return dict(SCALED_TEXTURE_STATS, size=len(SCALED_TEXTURE_CACHE))
+
+def load_font(size, path=FONT_PATH):
+    """Returns the shared Font for (path, size)"""
+    key = (path, size)
+    if key not in FONT_CACHE:
+        FONT_CACHE[key] = pygame.font.Font(path, size)
+    return FONT_CACHE[key]
+
+def render_text(font, text, color, antialias=True):
+    """font.render() through an LRU cache, the returned surface must not be modified"""
+    key = (font, text, tuple(color), antialias)
+    surface = TEXT_CACHE.get(key)
+    if surface is not None:
+        TEXT_CACHE_STATS["hits"] += 1
+        TEXT_CACHE.move_to_end(key)
+        return surface
+
+    TEXT_CACHE_STATS["misses"] += 1
+    surface = font.render(text, antialias, color)
+    TEXT_CACHE[key] = surface
+    if len(TEXT_CACHE) > TEXT_CACHE_LIMIT:
+        TEXT_CACHE.popitem(last=False)
+        TEXT_CACHE_STATS["evictions"] += 1
+    return surface
+
+def get_text_cache_stats():
+    """Returns a snapshot of the rendered text cache counters and hit rate"""
+    lookups = TEXT_CACHE_STATS["hits"] + TEXT_CACHE_STATS["misses"]
+    hit_rate = TEXT_CACHE_STATS["hits"] / lookups if lookups else 0.0
+    return dict(TEXT_CACHE_STATS, size=len(TEXT_CACHE), hit_rate=hit_rate)
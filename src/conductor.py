@@ -1,9 +1,10 @@
-import pygame
+from src.soundbank import sound_bank
+from src.clock import game_clock
 
 class Conductor:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or game_clock
         self.beat_interval = 600
-        self.tick_sound = pygame.mixer.Sound("./assets/tick.mp3")
         self.last_beat_time = 0
         self.next_beat_time = 0
         self.audio_delay = 25
@@ -25,12 +26,10 @@ class Conductor:
         self.beat_count = 0
         self.last_action_beat = -1  # Track which beat number the player last acted on
 
-        self.tick_sound.set_volume(.35)
-
     def start(self):
         if (self.active):
             return
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         self.last_beat_time = current_time
         self.next_beat_time = current_time + self.beat_interval
         self.active = True
@@ -44,7 +43,7 @@ class Conductor:
         if not self.active:
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # Update beat flash effect
         time_since_last_beat = current_time - self.last_beat_time
@@ -52,7 +51,7 @@ class Conductor:
 
         # Check if a new beat occurred
         if current_time >= self.next_beat_time:
-            self.tick_sound.play()
+            sound_bank.play("./assets/tick.mp3", "metronome", .35)
             self.last_beat_time = self.next_beat_time
             self.next_beat_time += self.beat_interval
             self.beat_flash = 1.0
@@ -68,7 +67,7 @@ class Conductor:
             return
 
         # Apply audio delay compensation to center the beat window
-        current_time = pygame.time.get_ticks() + self.audio_delay
+        current_time = self.clock.get_ticks() + self.audio_delay
 
         # Calculate timing relative to the beats
         time_since_last_beat = current_time - self.last_beat_time
@@ -106,7 +105,7 @@ class Conductor:
     def get_perfect_timing(self):
         """Returns True if timing is very close to perfect beat with audio delay compensation"""
         # Apply audio delay compensation
-        current_time = pygame.time.get_ticks() + self.audio_delay
+        current_time = self.clock.get_ticks() + self.audio_delay
 
         time_since_last_beat = current_time - self.last_beat_time
         time_until_next_beat = self.next_beat_time - current_time
@@ -1,5 +1,8 @@
 import pygame
 from src.gamestate import gamestate
+from src.display import dirty_regions
+from src.common import load_font, load_texture, render_text
+from src.clock import game_clock
 
 # Define the dialogue for each cutscene
 opening_cutscene_dialogue = [
@@ -23,16 +26,22 @@ final_cutscene_dialogue = [
 ]
 
 class CutsceneHandler:
-    def __init__(self, dialogue_list):
+    def __init__(self, dialogue_list, clock=None):
+        self.clock = clock or game_clock
         self.dialogue = dialogue_list
         self.current_line = 0
-        self.font = pygame.font.Font("./assets/Micro_Chat.ttf", 5)
-        self.background = pygame.image.load("./assets/textures/dywan.png")
+        self.font = load_font(5)
+        self.space_width = self.font.size(' ')[0]
+        self.background = None  # Resolved on first render, once the atlas is preloaded
         self.last_advance_time = 0
         self.cooldown_ms = 350
+        self.drawn_line = None
+
+        # Fully laid out pages (background, dialogue and prompt) keyed by (line, size)
+        self.pages = {}
 
     def handle_events(self, event):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
             # Check if enough time has passed since the last advance
             if current_time - self.last_advance_time >= self.cooldown_ms:
@@ -51,25 +60,49 @@ class CutsceneHandler:
                 gamestate.change_screen("mainmenu")
 
     def draw(self, surface):
+        size = surface.get_size()
+
+        # The page only changes when the dialogue advances
+        if self.drawn_line != self.current_line:
+            dirty_regions.mark_all()
+            self.drawn_line = self.current_line
+            # Lay out the next line now so advancing never has to
+            self.get_page(self.current_line + 1, size)
+
+        surface.blit(self.get_page(self.current_line, size), (0, 0))
+
+    def get_page(self, line, size):
+        """Returns the cached page surface for a dialogue line, rendering it on first use"""
+        key = (line, size)
+        if key not in self.pages:
+            self.pages[key] = self.render_page(line, size)
+        return self.pages[key]
+
+    def render_page(self, line, size):
+        page = pygame.Surface(size).convert()
+        if self.background is None:
+            self.background = load_texture("./assets/textures/dywan.png")
+
         # Draw tiled background
         bg_width = self.background.get_width()
         bg_height = self.background.get_height()
-        for y in range(0, surface.get_height(), bg_height):
-            for x in range(0, surface.get_width(), bg_width):
-                surface.blit(self.background, (x, y))
+        for y in range(0, page.get_height(), bg_height):
+            for x in range(0, page.get_width(), bg_width):
+                page.blit(self.background, (x, y))
 
-        # Draw current dialogue
-        if self.current_line < len(self.dialogue):
-            text = self.dialogue[self.current_line]
+        # Draw dialogue
+        if line < len(self.dialogue):
+            text = self.dialogue[line]
             # Create a rectangle that covers most of the screen for text rendering
-            text_area = pygame.Rect(40, 40, surface.get_width() - 80, surface.get_height() - 80)
-            self.draw_wrapped_text(surface, text, text_area)
+            text_area = pygame.Rect(40, 40, page.get_width() - 80, page.get_height() - 80)
+            self.draw_wrapped_text(page, text, text_area)
 
             # Draw prompt
-            prompt_font = pygame.font.Font("./assets/Micro_Chat.ttf", 5)
-            prompt = prompt_font.render("Press SPACE to continue", True, (255, 255, 255))
-            surface.blit(prompt, (surface.get_width() - prompt.get_width() - 20,
-                                 surface.get_height() - prompt.get_height() - 20))
+            prompt = render_text(self.font, "Press SPACE to continue", (255, 255, 255))
+            page.blit(prompt, (page.get_width() - prompt.get_width() - 20,
+                               page.get_height() - prompt.get_height() - 20))
+
+        return page
 
     def draw_wrapped_text(self, surface, text, rect, color=(255, 255, 255)):
         # Split speaker from dialogue
@@ -83,7 +116,7 @@ class CutsceneHandler:
             speaker, message = parts
             # Draw speaker name in yellow
             speaker_text = speaker + ": "
-            speaker_surface = self.font.render(speaker_text, True, (255, 255, 0))
+            speaker_surface = render_text(self.font, speaker_text, (255, 255, 0))
             surface.blit(speaker_surface, (current_x, current_y))
 
             # Update position after speaker name
@@ -94,7 +127,7 @@ class CutsceneHandler:
 
             for word in words:
                 # Render the word to get its width
-                word_surface = self.font.render(word, True, color)
+                word_surface = render_text(self.font, word, color)
                 word_width = word_surface.get_width()
 
                 # Check if adding this word would exceed the rect width
@@ -107,14 +140,14 @@ class CutsceneHandler:
                 surface.blit(word_surface, (current_x, current_y))
 
                 # Move position for next word (add space)
-                current_x += word_width + self.font.size(' ')[0]
+                current_x += word_width + self.space_width
 
         else:
             # Just a single line with no speaker
             words = text.split(' ')
 
             for word in words:
-                word_surface = self.font.render(word, True, color)
+                word_surface = render_text(self.font, word, color)
                 word_width = word_surface.get_width()
 
                 if current_x + word_width > rect.right:
@@ -122,4 +155,4 @@ class CutsceneHandler:
                     current_y += line_height
 
                 surface.blit(word_surface, (current_x, current_y))
-                current_x += word_width + self.font.size(' ')[0]
+                current_x += word_width + self.space_width
@@ -0,0 +1,154 @@
+import pygame
+
+# From this integer scale up block_scale() beats pygame.transform.scale, below it SDL's scaler is faster
+BLOCK_SCALE_MIN = 3
+
+def convert_for_display(surface):
+    """convert_alpha() when a display is open, headless runs keep the surface as decoded"""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+class DirtyRegions:
+    """Collects the regions of the game surface that changed this frame"""
+    def __init__(self):
+        self.enabled = False
+        self.rects = []
+        self.full_redraw = True
+
+    def mark(self, rect):
+        if self.enabled:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.full_redraw = True
+
+    def take(self, surface_rect):
+        """Returns the changed regions clipped to surface_rect and resets the tracker"""
+        if self.full_redraw:
+            rects = [pygame.Rect(surface_rect)]
+        else:
+            rects = [rect.clip(surface_rect) for rect in self.rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+        self.rects = []
+        self.full_redraw = False
+        return rects
+
+dirty_regions = DirtyRegions()
+
+def block_scale(source, target, scale):
+    """Nearest-neighbour upscale by a whole factor, writing straight into target's pixels
+
+    target must be exactly scale times the size of source, both 32-bit in the same pixel format.
+    """
+    width, height = source.get_size()
+    source_pixels = pygame.surfarray.pixels2d(source)
+    # Indexed [x, x within block, y, y within block], a view onto the target's pixels
+    blocks = pygame.surfarray.pixels2d(target).reshape(width, scale, height, scale)
+    # Fill the first row of every block, then copy it down the remaining rows
+    blocks[:, :, :, 0] = source_pixels[:, None, :]
+    blocks[:, :, :, 1:] = blocks[:, :, :, :1]
+
+class Presenter:
+    """Upscales the game surface into the window without allocating per frame"""
+    def __init__(self, game_surface):
+        self.game_surface = game_surface
+        self.game_w, self.game_h = game_surface.get_size()
+        self.window = None
+        self.target = None
+        self.target_rect = pygame.Rect(0, 0, 0, 0)
+        self.integer_scale = 0  # 0 when the window is not an exact multiple of the game size
+        self.use_block_scale = False
+
+    def resize(self, window):
+        """Recomputes the letterboxed target area, call after every set_mode"""
+        self.window = window
+        window_w, window_h = window.get_size()
+
+        if (window_w % self.game_w == 0 and window_h % self.game_h == 0 and
+                window_w // self.game_w == window_h // self.game_h):
+            self.integer_scale = window_w // self.game_w
+            scaled_w = self.game_w * self.integer_scale
+            scaled_h = self.game_h * self.integer_scale
+        else:
+            self.integer_scale = 0
+            scale_factor = min(window_w / self.game_w, window_h / self.game_h)
+            scaled_w = int(self.game_w * scale_factor)
+            scaled_h = int(self.game_h * scale_factor)
+
+        self.target_rect = pygame.Rect((window_w - scaled_w) // 2, (window_h - scaled_h) // 2,
+                                       scaled_w, scaled_h)
+        # Scale straight into the window instead of into a fresh surface
+        self.target = window.subsurface(self.target_rect)
+        window.fill((0, 0, 0))
+
+        # Block scaling copies raw pixels, so it needs both surfaces in the same 32-bit format
+        self.use_block_scale = (self.integer_scale >= BLOCK_SCALE_MIN and
+                                window.get_bitsize() == self.game_surface.get_bitsize() == 32 and
+                                window.get_masks() == self.game_surface.get_masks())
+
+    def scale_into(self, source, target):
+        """Scales source into target, which is its size times the current scale"""
+        if self.integer_scale == 1:
+            target.blit(source, (0, 0))
+        elif self.use_block_scale:
+            block_scale(source, target, self.integer_scale)
+        else:
+            pygame.transform.scale(source, target.get_size(), target)
+
+    def present(self):
+        """Scales the whole game surface into the window and flips"""
+        self.scale_into(self.game_surface, self.target)
+        pygame.display.flip()
+
+    def present_regions(self, rects):
+        """Scales only the given game surface regions into the window and updates them"""
+        window_rects = []
+        for rect in rects:
+            if rect == self.game_surface.get_rect():
+                self.present()
+                return
+            window_rect = self.to_window_rect(rect)
+            self.scale_into(self.game_surface.subsurface(rect), self.window.subsurface(window_rect))
+            window_rects.append(window_rect)
+        if window_rects:
+            pygame.display.update(window_rects)
+
+    def to_window_rect(self, rect):
+        """Maps a rect on the game surface to the window area it is scaled into"""
+        if self.integer_scale:
+            scale = self.integer_scale
+            return pygame.Rect(self.target_rect.x + rect.x * scale, self.target_rect.y + rect.y * scale,
+                               rect.width * scale, rect.height * scale)
+        left = self.target_rect.x + rect.left * self.target_rect.width // self.game_w
+        top = self.target_rect.y + rect.top * self.target_rect.height // self.game_h
+        right = self.target_rect.x + rect.right * self.target_rect.width // self.game_w
+        bottom = self.target_rect.y + rect.bottom * self.target_rect.height // self.game_h
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+def benchmark(scales=(2, 3, 4, 6, 9), frames=200):
+    """Times presenting at each integer scale with pygame.transform.scale and with block_scale()"""
+    import time
+
+    results = []
+    for scale in scales:
+        window = pygame.display.set_mode((256 * scale, 240 * scale))
+        game_surface = pygame.Surface((256, 240)).convert()
+        for x in range(0, 256, 8):
+            pygame.draw.line(game_surface, (x, 255 - x, 7 * x % 256), (x, 0), (255 - x, 239))
+
+        timings = {}
+        for name, scale_into in (("transform", lambda: pygame.transform.scale(game_surface, window.get_size(), window)),
+                                 ("block", lambda: block_scale(game_surface, window, scale))):
+            start_time = time.perf_counter()
+            for _ in range(frames):
+                scale_into()
+            timings[name] = (time.perf_counter() - start_time) * 1000 / frames
+        results.append({"scale": scale, "transform_ms": timings["transform"], "block_ms": timings["block"]})
+    return results
+
+if __name__ == "__main__":
+    pygame.init()
+    for result in benchmark():
+        print(f"{result['scale']}x: transform.scale {result['transform_ms']:.2f} ms, "
+              f"block_scale {result['block_ms']:.2f} ms per frame")
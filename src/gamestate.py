@@ -1,6 +1,6 @@
 class GameState:
     def __init__(self):
-        self.screen = "introvideo"
+        self.screen = "loading"
         self.current_level = 0  # 0=no level, 1-3 for actual levels
         self.cutscene_index = 0  # For tracking which cutscene is playing
 
@@ -0,0 +1,103 @@
+"""Runs levels without a display or audio, as fast as the CPU allows
+
+    python -m src.headless --level 2 --steps 20000 --seed 1
+    python -m src.headless --map-size 1024 --steps 5000 --seed 1
+"""
+import argparse
+import random
+import time
+import pygame
+import src.levels as levels
+from src.mapgen import make_generated_level
+from src.clock import GameClock, SIM_STEP_MS
+from src.player import PlayerState
+
+LEVEL_FACTORIES = {
+    1: levels.make_lvl_1,
+    2: levels.make_lvl_2,
+    3: levels.make_lvl_3,
+}
+
+MOVE_KEYS = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]
+SHOOT_KEY = pygame.K_SPACE
+
+def scripted_policy(script):
+    """Policy pressing the keys listed for each step, script is {step: [key, ...]}"""
+    def policy(level, step):
+        return script.get(step, [])
+    return policy
+
+def random_beat_policy(rng, shoot_chance=0.3):
+    """Policy acting once per beat while on-beat: shoots or moves in a random direction"""
+    last_beat = [-1]
+
+    def policy(level, step):
+        conductor = level.conductor
+        if not conductor.is_on_beat() or conductor.beat_count == last_beat[0]:
+            return []
+        last_beat[0] = conductor.beat_count
+        if level.player.pellets > 0 and rng.random() < shoot_chance:
+            return [SHOOT_KEY]
+        return [rng.choice(MOVE_KEYS)]
+    return policy
+
+def run_level(make_level, steps, policy=None, seed=None, player_pos=None):
+    """Simulates a level for a number of fixed steps on a manual clock and returns run statistics"""
+    if seed is not None:
+        random.seed(seed)
+    clock = GameClock("manual")
+    level = make_level(clock=clock)
+    level.add_player(*(player_pos or level.spawn))
+    level.conductor.start()
+    policy = policy or random_beat_policy(random.Random(seed))
+
+    start = time.perf_counter()
+    step = 0
+    completed = False
+    while step < steps:
+        clock.tick(SIM_STEP_MS)
+        for key in policy(level, step):
+            level.handle_player_movement(pygame.event.Event(pygame.KEYDOWN, key=key))
+        level.update()
+        step += 1
+        if level.check_level_completion():
+            completed = True
+            break
+        if level.player.state == PlayerState.DEAD:
+            break
+    wall_time = time.perf_counter() - start
+
+    return {
+        "steps": step,
+        "sim_ms": clock.get_ticks(),
+        "wall_s": wall_time,
+        "steps_per_s": step / wall_time if wall_time else float("inf"),
+        "completed": completed,
+        "player_health": level.player.current_health,
+        "enemies_left": len(level.enemies),
+        "max_streak": level.max_streak,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a level headless with scripted input")
+    parser.add_argument("--level", type=int, choices=sorted(LEVEL_FACTORIES), default=1)
+    parser.add_argument("--steps", type=int, default=60 * 60)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--map-size", type=int, default=None,
+                        help="run a generated map this many tiles wide and high instead of --level")
+    args = parser.parse_args()
+
+    for run in range(args.runs):
+        seed = None if args.seed is None else args.seed + run
+        if args.map_size:
+            def make_level(clock=None):
+                return make_generated_level(args.map_size, args.map_size, seed, clock)
+        else:
+            make_level = LEVEL_FACTORIES[args.level]
+        stats = run_level(make_level, args.steps, seed=seed)
+        print(" ".join(f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+                       for key, value in stats.items()))
+
+if __name__ == "__main__":
+    main()
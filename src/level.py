@@ -1,22 +1,33 @@
 import pygame
-import math
-from src.pellet import Pellet
-from src.enemy import Enemy
+import numpy as np
+from src.pellet import PelletSystem
+from src.pathfinding import DistanceField, DIRECTIONS
+from src.enemy import Enemy, MAX_PATH_LENGTH
 from src.conductor import Conductor
-from src.common import TILE_SIZE
+from src.common import TILE_SIZE, CHUNK_SIZE, render_text
 from src.tiletype import TileType
-from src.tile import Tile
+from src.tile import TILE_TABLE, TILE_IDS, TILE_WALKABLE
+from src.tilechunks import TileChunkCache
 from src.camera import Camera
 from src.player import Player, PlayerState
 from src.gamestate import gamestate
+from src.display import dirty_regions
+from src.clock import game_clock
+
+# Enemy level of detail, in chunks around the chunk the player stands in
+ACTIVE_CHUNK_RADIUS = 1  # Enemies this close get the full update, covers the view and detection range
+BEAT_CHUNK_RADIUS = 3    # Further out up to here they only step on beats, beyond that they sleep
 
 class Level:
-    def __init__(self, width, height, default_tile_type=None):
+    def __init__(self, width, height, default_tile_type=None, clock=None):
         self.width = width
         self.height = height
+        self.clock = clock or game_clock
         self.player = None
+        self.spawn = (1, 1)  # Player start tile
+        self.door = (width // 2, 0)  # Exit door tile, the player leaves from the tile below it
         self.camera = None
-        self.conductor = Conductor()
+        self.conductor = Conductor(self.clock)
         self.rhythm_streak = 0
         self.max_streak = 0
         self.last_hit_time = 0
@@ -26,43 +37,163 @@ class Level:
         self.last_had_streak = False
 
         self.enemies = []
-        self.pellets = []
-        self.grid = []
-
-        # Initialize grid with default tile type
-        for y in range(height):
-            row = []
-            for x in range(width):
-                if default_tile_type:
-                    row.append(Tile(default_tile_type))
-                else:
-                    row.append(None)
-            self.grid.append(row)
+        self.pellets = PelletSystem(self.clock)
+
+        # Tile ID (index into TILE_TABLE) of every tile, indexed y * width + x, 0 where there's no tile
+        default_id = TILE_IDS[default_tile_type] if default_tile_type else 0
+        self.tiles = bytearray([default_id]) * (width * height)
+
+        # Enemy standing on each occupied tile, keyed y * width + x, and a 0/1 mirror for batch lookups
+        self.occupancy = {}
+        self.occupied = bytearray(width * height)
+        # Enemies standing in each chunk, keyed by chunk index, only chunks with enemies have a list
+        self.chunks_x = (width + CHUNK_SIZE - 1) // CHUNK_SIZE
+        self.chunks_y = (height + CHUNK_SIZE - 1) // CHUNK_SIZE
+        self.chunk_enemies = {}
+        # 1 where a tile exists and has no wall collision, same indexing
+        self.walkable = bytearray([TILE_WALKABLE[default_id]]) * (width * height)
+
+        # Distance to the player from every tile, shared by all enemies, created with the first search
+        self.flow_field = None
+        self.flow_field_goal = None
+
+        # Pre-rendered chunks of the tile grid, rasterized as the camera gets near them
+        self.tile_chunks = TileChunkCache(self)
 
     def set_tile(self, x, y, tile_type):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x] = Tile(tile_type)
+            tile_id = TILE_IDS[tile_type]
+            self.tiles[y * self.width + x] = tile_id
+            self.walkable[y * self.width + x] = TILE_WALKABLE[tile_id]
+            self.flow_field_goal = None
+            self.tile_chunks.repaint_tile(x, y)
             return True
         return False
 
+    def set_tiles(self, tile_ids):
+        """Replaces the whole grid at once, tile_ids holds height x width tile IDs row by row"""
+        tile_ids = np.asarray(tile_ids, dtype=np.uint8).reshape(self.width * self.height)
+        self.tiles[:] = tile_ids.tobytes()
+        self.walkable[:] = np.frombuffer(TILE_WALKABLE, dtype=np.uint8)[tile_ids].tobytes()
+        self.flow_field_goal = None
+        self.tile_chunks.clear()
+
     def get_tile(self, x, y):
+        """Returns the shared Tile for the type at x, y, or None"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x]
+            return TILE_TABLE[self.tiles[y * self.width + x]]
         return None
 
+    def is_walkable(self, x, y):
+        """True if x, y is inside the level on a tile without wall collision"""
+        return 0 <= x < self.width and 0 <= y < self.height and self.walkable[y * self.width + x] == 1
+
+    def neighbour_masks(self, x, y, width, height):
+        """Walkable cardinal neighbours of every tile in a region, row by row
+
+        Each byte has bit i set when the neighbour in direction DIRECTIONS[i] is walkable.
+        """
+        grid = np.frombuffer(self.walkable, dtype=np.uint8).reshape(self.height, self.width)
+        # The region with a one tile border, tiles outside the level stay 0 (not walkable)
+        padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        left, top = max(0, x - 1), max(0, y - 1)
+        right, bottom = min(self.width, x + width + 1), min(self.height, y + height + 1)
+        if left < right and top < bottom:
+            padded[top - y + 1:bottom - y + 1, left - x + 1:right - x + 1] = grid[top:bottom, left:right]
+
+        # Each direction's bit comes from the padded grid shifted by that direction
+        masks = np.zeros((height, width), dtype=np.uint8)
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            masks |= padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] << bit
+        return bytearray(masks.tobytes())
+
+    def get_flow_field(self):
+        """Steps to the player's tile from every tile up to MAX_PATH_LENGTH away, UNREACHED further out
+
+        Recomputed only after the player or grid changes.
+        """
+        goal = (self.player.tile_x, self.player.tile_y)
+        if self.flow_field_goal != goal:
+            if self.flow_field is None:
+                self.flow_field = DistanceField(self.width, self.height, MAX_PATH_LENGTH)
+            self.flow_field.search(goal[1] * self.width + goal[0], self.walkable.__getitem__)
+            self.flow_field_goal = goal
+        return self.flow_field.distance
+
     def add_enemy(self, x, y, health=3, texnum=0):
-        enemy = Enemy(x, y, health, texnum)
+        enemy = Enemy(x, y, health, texnum, self.clock)
         self.enemies.append(enemy)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.place_enemy(enemy, x, y)
         return enemy
 
+    def remove_enemy(self, enemy):
+        self.enemies.remove(enemy)
+        self.vacate(enemy)
+
+    def enemy_at(self, x, y):
+        """Returns the enemy occupying tile x, y or None"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.occupancy.get(y * self.width + x)
+        return None
+
+    def move_enemy(self, enemy, x, y):
+        """Moves an enemy's occupancy entry to tile x, y, call before updating its tile position"""
+        self.vacate(enemy)
+        self.place_enemy(enemy, x, y)
+
+    def place_enemy(self, enemy, x, y):
+        """Records the enemy on tile x, y in the occupancy grid and its chunk"""
+        self.occupancy[y * self.width + x] = enemy
+        self.occupied[y * self.width + x] = 1
+        self.chunk_enemies.setdefault(self.chunk_index(x, y), []).append(enemy)
+
+    def vacate(self, enemy):
+        """Clears the enemy's current tile in the occupancy grid and its chunk"""
+        if 0 <= enemy.tile_x < self.width and 0 <= enemy.tile_y < self.height:
+            index = enemy.tile_y * self.width + enemy.tile_x
+            if self.occupancy.get(index) is enemy:
+                del self.occupancy[index]
+                self.occupied[index] = 0
+
+            chunk = self.chunk_index(enemy.tile_x, enemy.tile_y)
+            bucket = self.chunk_enemies.get(chunk)
+            if bucket and enemy in bucket:
+                bucket.remove(enemy)
+                if not bucket:
+                    del self.chunk_enemies[chunk]
+
+    def enemies_by_detail(self):
+        """Splits the enemies near the player into fully updated and beat-only ones, the rest sleep"""
+        if self.player is None or max(self.chunks_x, self.chunks_y) <= ACTIVE_CHUNK_RADIUS + 1:
+            # Every chunk is always in the active area, keep the original update order
+            return self.enemies, []
+
+        player_chunk_x = self.player.tile_x // CHUNK_SIZE
+        player_chunk_y = self.player.tile_y // CHUNK_SIZE
+        active, beat_only = [], []
+        for chunk_y in range(max(0, player_chunk_y - BEAT_CHUNK_RADIUS),
+                             min(self.chunks_y, player_chunk_y + BEAT_CHUNK_RADIUS + 1)):
+            for chunk_x in range(max(0, player_chunk_x - BEAT_CHUNK_RADIUS),
+                                 min(self.chunks_x, player_chunk_x + BEAT_CHUNK_RADIUS + 1)):
+                bucket = self.chunk_enemies.get(chunk_y * self.chunks_x + chunk_x)
+                if bucket:
+                    ring = max(abs(chunk_x - player_chunk_x), abs(chunk_y - player_chunk_y))
+                    (active if ring <= ACTIVE_CHUNK_RADIUS else beat_only).extend(bucket)
+        return active, beat_only
+
+    def chunk_index(self, x, y):
+        """Index of the chunk containing tile x, y"""
+        return (y // CHUNK_SIZE) * self.chunks_x + x // CHUNK_SIZE
+
     def add_player(self, x, y):
         # Add a player to the level at tile coordinates x, y
-        self.player = Player(x, y)
+        self.player = Player(x, y, self.clock)
         return self.player
 
     def add_pellet(self, x, y, direction):
         """Add a new pellet to the level"""
-        self.pellets.append(Pellet(x, y, direction))
+        self.pellets.add(x, y, direction)
 
     def init_camera(self, view_width, view_height):
         self.camera = Camera(view_width, view_height)
@@ -73,11 +204,10 @@ class Level:
         # Check if there are any enemies left
         if not self.enemies:
             # No enemies left, check if player is at the door
-            door_x = self.width // 2
-            door_y = 0
+            door_x, door_y = self.door
 
             # If player is standing in front of the door
-            if self.player and self.player.tile_x == door_x and self.player.tile_y == 1:
+            if self.player and self.player.tile_x == door_x and self.player.tile_y == door_y + 1:
                 return True
         return False
 
@@ -109,7 +239,7 @@ class Level:
                     # Check if shooting is on beat for rhythm mechanics
                     on_beat = self.conductor.is_on_beat()
                     if not on_beat and self.rhythm_streak > 0:
-                        self.streak_broken_time = pygame.time.get_ticks()
+                        self.streak_broken_time = self.clock.get_ticks()
                         self.has_shown_streak_broken = True
                         self.last_had_streak = True
                         self.rhythm_streak = 0
@@ -146,7 +276,7 @@ class Level:
                     # Increment streak
                     self.rhythm_streak += 1
                     self.max_streak = max(self.max_streak, self.rhythm_streak)
-                    self.last_hit_time = pygame.time.get_ticks()
+                    self.last_hit_time = self.clock.get_ticks()
 
                     # Reset streak broken flag when player starts a new streak
                     if self.rhythm_streak == 1:
@@ -155,7 +285,7 @@ class Level:
                 else:
                     # Off-beat movement breaks the streak
                     if self.rhythm_streak > 0:
-                        self.streak_broken_time = pygame.time.get_ticks()
+                        self.streak_broken_time = self.clock.get_ticks()
                         self.has_shown_streak_broken = True
                         self.last_had_streak = True
 
@@ -302,7 +432,7 @@ class Level:
             # surface.blit(max_surface, (40, 35))
 
         # Show timing feedback or streak break message
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # Only show "STREAK BROKEN" if:
         # 1. We just broke a streak (within the last 500ms)
@@ -330,7 +460,7 @@ class Level:
                 else:
                     color = (255, 255, 255)  # White default
 
-                timing_surface = font.render(timing_text, True, color)
+                timing_surface = render_text(font, timing_text, color)
                 surface.blit(timing_surface, (164, 0))
 
     def update(self):
@@ -347,7 +477,7 @@ class Level:
                 # Player missed a beat, reset streak
                 if self.rhythm_streak > 0:
                     # Only show the streak broken message if we actually had a streak
-                    self.streak_broken_time = pygame.time.get_ticks()
+                    self.streak_broken_time = self.clock.get_ticks()
                     self.has_shown_streak_broken = True
                     self.last_had_streak = True
 
@@ -364,82 +494,44 @@ class Level:
             self.camera.center_on(self.player.tile_x, self.player.tile_y, self.width, self.height)
             self.camera.update()
 
-        active_pellets = []
-        for pellet in self.pellets:
-            pellet.update()
-
-            # Check collisions with walls
-            tile_x = int(pellet.x / TILE_SIZE)
-            tile_y = int(pellet.y / TILE_SIZE)
+        self.pellets.update(self)
 
-            # Check if out of bounds or hitting a wall
-            if (tile_x < 0 or tile_x >= self.width or
-                tile_y < 0 or tile_y >= self.height or
-                (self.get_tile(tile_x, tile_y) and self.get_tile(tile_x, tile_y).has_collision())):
-                pellet.active = False
-
-            # Check collisions with enemies
-            for enemy in list(self.enemies):  # Use a copy of the list since we might modify it
-                if pellet.active and pellet.check_collision(enemy):
-                    # Enemy hit
-                    if enemy.take_damage():
-                        # Enemy killed
-                        self.enemies.remove(enemy)
-                    break
-
-            if pellet.active:
-                active_pellets.append(pellet)
-
-        # Update the pellet list
-        self.pellets = active_pellets
-
-        for enemy in self.enemies:
+        # Only enemies near the player are simulated
+        active, beat_only = self.enemies_by_detail()
+        for enemy in active:
             enemy.update(self, self.conductor)
+        for enemy in beat_only:
+            enemy.beat_update(self, self.conductor)
 
-    def draw(self, surface, font=None):
-        # Clear surface with background color
+    def draw(self, surface, font=None, alpha=1.0):
+        """Draws the level, alpha (0-1) interpolates between the last two simulation steps"""
+        # Clear surface with background color, the camera keeps the whole view moving
         surface.fill((0, 0, 0))
+        dirty_regions.mark_all()
 
         if self.camera:
             # Round camera position to nearest pixel
-            camera_x = round(self.camera.x)
-            camera_y = round(self.camera.y)
-
-            # Calculate visible tiles
-            start_tile_x = math.floor(camera_x / TILE_SIZE)
-            start_tile_y = math.floor(camera_y / TILE_SIZE)
-
-            # Add buffer tiles
-            visible_tiles_x = math.ceil(self.camera.width / TILE_SIZE) + 2
-            visible_tiles_y = math.ceil(self.camera.height / TILE_SIZE) + 2
-
-            # Clamp to level boundaries
-            start_tile_x = max(0, start_tile_x)
-            start_tile_y = max(0, start_tile_y)
-            end_tile_x = min(self.width, start_tile_x + visible_tiles_x)
-            end_tile_y = min(self.height, start_tile_y + visible_tiles_y)
-
-            # Draw tiles with consistent rounding
-            for y in range(start_tile_y, end_tile_y):
-                for x in range(start_tile_x, end_tile_x):
-                    tile = self.grid[y][x]
-                    if tile:
-                        draw_x = int(x * TILE_SIZE - camera_x)
-                        draw_y = int(y * TILE_SIZE - camera_y)
-                        tile.draw(surface, draw_x, draw_y, TILE_SIZE)
+            view_x, view_y = self.camera.get_position(alpha)
+            camera_x = round(view_x)
+            camera_y = round(view_y)
+
+            # Draw the tile chunks in view
+            self.tile_chunks.draw(surface, camera_x, camera_y)
 
+            view_w, view_h = surface.get_size()
             for enemy in self.enemies:
-                draw_x = int(enemy.pixel_x - camera_x)
-                draw_y = int(enemy.pixel_y - camera_y)
-                enemy.draw(surface, draw_x, draw_y)
+                draw_x = int(enemy.prev_pixel_x + (enemy.pixel_x - enemy.prev_pixel_x) * alpha - camera_x)
+                draw_y = int(enemy.prev_pixel_y + (enemy.pixel_y - enemy.prev_pixel_y) * alpha - camera_y)
+                # Skip enemies outside the view
+                if -TILE_SIZE < draw_x < view_w and -TILE_SIZE < draw_y < view_h:
+                    enemy.draw(surface, draw_x, draw_y)
 
-            for pellet in self.pellets:
-                pellet.draw(surface, self.camera.x, self.camera.y)
+            self.pellets.draw(surface, view_x, view_y, alpha)
 
             # Draw player with consistent positioning
             if self.player:
-                player_x = int(self.player.pixel_x - camera_x)
-                player_y = int(self.player.pixel_y - camera_y)
+                player_x = int(self.player.prev_pixel_x + (self.player.pixel_x - self.player.prev_pixel_x) * alpha - camera_x)
+                player_y = int(self.player.prev_pixel_y + (self.player.pixel_y - self.player.prev_pixel_y) * alpha - camera_y)
                 self.player.draw(surface, player_x, player_y)
 
         if self.player:
@@ -451,13 +543,13 @@ class Level:
 
         if self.player and self.player.state == PlayerState.DEAD:
                 game_over_text = "GAME OVER"
-                text_surf = font.render(game_over_text, True, (255, 0, 0))
+                text_surf = render_text(font, game_over_text, (255, 0, 0))
                 text_rect = text_surf.get_rect(center=(surface.get_width() // 2, surface.get_height() // 2))
                 surface.blit(text_surf, text_rect)
 
                 # Draw restart instruction
                 restart_text = "Press R to restart"
-                restart_surf = font.render(restart_text, True, (255, 255, 255))
+                restart_surf = render_text(font, restart_text, (255, 255, 255))
                 restart_rect = restart_surf.get_rect(center=(surface.get_width() // 2,
                                                              surface.get_height() // 2 + 20))
                 surface.blit(restart_surf, restart_rect)
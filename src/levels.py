@@ -1,16 +1,16 @@
 from src.level import Level
 
-def make_lvl_1():
-    level = Level(11, 11)
+def make_lvl_1(clock=None):
+    level = Level(11, 11, clock=clock)
     level.construct_lvl1()
     return level
 
-def make_lvl_2():
-    level = Level(10, 10)
+def make_lvl_2(clock=None):
+    level = Level(10, 10, clock=clock)
     level.construct_lvl2()
     return level
 
-def make_lvl_3():
-    level = Level(10, 10)
+def make_lvl_3(clock=None):
+    level = Level(10, 10, clock=clock)
     level.construct_lvl3()
     return level
@@ -0,0 +1,98 @@
+import queue
+import threading
+import pygame
+from src.gamestate import gamestate
+from src.display import dirty_regions
+from src.atlas import ATLAS_IMAGE, install_atlas
+from src.common import TEXTURE_CACHE, SOUND_CACHE, load_font, render_text
+from src.intro import INTRO_TIMELINE, INTRO_MUSIC, prepare_intro
+from src.mainmenu import MENU_FRAMES, MENU_LOGO, prepare_menu
+
+# Everything decoded before the intro starts
+ASSET_MANIFEST = {
+    "images": [ATLAS_IMAGE, MENU_LOGO] + MENU_FRAMES + [keyframe["image"] for keyframe in INTRO_TIMELINE],
+    "sounds": [INTRO_MUSIC, "./assets/tick.mp3", "./assets/Hit10.wav", "./assets/Blip3.wav"],
+}
+
+# Main-thread setup run after everything is decoded, one task per frame, each gets the game surface.
+# Scenes add their own so their first frame has nothing left to build.
+PREPARE_TASKS = [prepare_intro, prepare_menu]
+
+# Global variables for the loading screen
+preloader = None
+prepared_count = 0
+
+class Preloader:
+    """Decodes the manifest on a worker thread, the main thread converts and caches the results"""
+    def __init__(self, manifest):
+        self.jobs = ([("image", path) for path in manifest["images"]] +
+                     [("sound", path) for path in manifest["sounds"]])
+        self.loaded = queue.Queue()
+        self.finished_count = 0
+        self.thread = threading.Thread(target=self.work, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def work(self):
+        for kind, path in self.jobs:
+            try:
+                if kind == "image":
+                    asset = pygame.image.load(path)
+                else:
+                    asset = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as e:
+                # Leave it to the lazy loaders, which will report it where it is used
+                print(f"Error preloading {path}: {e}")
+                asset = None
+            self.loaded.put((kind, path, asset))
+
+    def update(self):
+        """Finishes whatever the worker has decoded so far, must run on the main thread"""
+        while not self.loaded.empty():
+            kind, path, asset = self.loaded.get_nowait()
+            if asset is not None:
+                if kind == "sound":
+                    SOUND_CACHE[path] = asset
+                elif path == ATLAS_IMAGE:
+                    install_atlas(asset)
+                else:
+                    # Converting needs the display, so it cannot happen on the worker
+                    TEXTURE_CACHE[path] = asset.convert_alpha()
+            self.finished_count += 1
+
+    @property
+    def done(self):
+        return self.finished_count >= len(self.jobs)
+
+def handle_loading_drawing(surface):
+    global preloader, prepared_count
+
+    if preloader is None:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        preloader = Preloader(ASSET_MANIFEST)
+        preloader.start()
+
+    preloader.update()
+    if preloader.done and prepared_count < len(PREPARE_TASKS):
+        PREPARE_TASKS[prepared_count](surface)
+        prepared_count += 1
+
+    surface.fill((0, 0, 0))
+    dirty_regions.mark_all()
+
+    # Progress bar in the middle of the screen
+    bar_rect = pygame.Rect(0, 0, surface.get_width() // 2, 6)
+    bar_rect.center = (surface.get_width() // 2, surface.get_height() // 2)
+    pygame.draw.rect(surface, (255, 255, 255), bar_rect, 1)
+    fill_rect = bar_rect.inflate(-4, -4)
+    steps = len(preloader.jobs) + len(PREPARE_TASKS)
+    fill_rect.width = int(fill_rect.width * (preloader.finished_count + prepared_count) / steps)
+    surface.fill((255, 255, 255), fill_rect)
+
+    text = render_text(load_font(5), "loading", (255, 255, 255))
+    surface.blit(text, text.get_rect(centerx=bar_rect.centerx, bottom=bar_rect.top - 6))
+
+    if preloader.done and prepared_count == len(PREPARE_TASKS):
+        gamestate.change_screen("introvideo")
@@ -2,94 +2,117 @@ import pygame
 import math
 from pygame.event import Event
 from src.gamestate import gamestate
-from src.common import load_texture
+from src.common import load_texture, load_font, render_text
+from src.display import dirty_regions
+from src.clock import game_clock
 
 # Global variables for the main menu
 menu_initialized = False
+menu_frames = None  # Baked frames, built by prepare_menu()
+PROMPT_ALPHA_STEPS = 16
+MENU_FRAMES = [f"./assets/menu/m{i}.png" for i in range(1, 15)]  # m1.png through m14.png
+MENU_LOGO = "./assets/menu/logo.png"
 
 def handle_menu_events(event: Event):
-    current_time = pygame.time.get_ticks()
+    current_time = game_clock.get_ticks()
     if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
         if current_time - menu_load_time >= 1000:
             gamestate.change_screen("openingcutscene")
 
-def initialize_menu():
-    global menu_initialized, menu_frames, font, start_time, current_frame, last_frame_time, logo_image, menu_load_time
+def prepare_menu(surface):
+    """Bakes the menu frames and prompt steps for the surface size, done while the loading screen is up"""
+    global menu_frames, prompt_steps, prompt_rect
 
-    menu_load_time = pygame.time.get_ticks()
+    surface_w, surface_h = surface.get_size()
 
-    # Load all 14 menu frames
-    menu_frames = []
-    for i in range(1, 15):  # Load m1.png through m14.png
-        menu_frames.append(load_texture(f"./assets/menu/m{i}.png"))
+    # Get the font for the text
+    font = load_font(5)
 
     # Load the logo
-    logo_image = load_texture("./assets/menu/logo.png")
+    logo_image = load_texture(MENU_LOGO)
 
-    # Get the font for the text
-    font = pygame.font.Font("./assets/Micro_Chat.ttf", 5)
+    # Static captions in the top right corner
+    captions = []
+    title_text = render_text(font, "team blahajtron 2025", (255, 255, 255))
+    captions.append((title_text, title_text.get_rect(topright=(surface_w - 5, 5))))
+    title_text = render_text(font, "kogni hackathon", (255, 255, 255))
+    captions.append((title_text, title_text.get_rect(topright=(surface_w - 5, 15))))
+
+    # Load all 14 menu frames, scaled to fit the surface with the logo and captions baked in
+    menu_frames = []
+    for frame_path in MENU_FRAMES:
+        # The frames are partly transparent, so they're blended over black as when drawn each frame
+        frame = pygame.Surface((surface_w, surface_h)).convert()
+        frame.fill((0, 0, 0))
+        frame.blit(pygame.transform.scale(load_texture(frame_path), (surface_w, surface_h)), (0, 0))
+        # Draw the logo at 1:1 scale over the background
+        frame.blit(logo_image, (0, 0))
+        for caption, caption_rect in captions:
+            frame.blit(caption, caption_rect)
+        menu_frames.append(frame)
+
+    # Precompute the pulsing prompt at a fixed set of opacities
+    text_surface = render_text(font, "Press Spacebar to start", (255, 255, 255))
+    prompt_steps = []
+    for step in range(PROMPT_ALPHA_STEPS):
+        alpha = 128 + 127 * step // (PROMPT_ALPHA_STEPS - 1)
+
+        # Create a surface with per-pixel alpha
+        text_surface_alpha = pygame.Surface(text_surface.get_size(), pygame.SRCALPHA)
+
+        # Blit the text onto the alpha surface with the calculated alpha
+        text_surface_alpha.fill((255, 255, 255, alpha))
+        text_surface_alpha.blit(text_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+        prompt_steps.append(text_surface_alpha)
+
+    # Position the text at the lower portion of the screen
+    prompt_rect = text_surface.get_rect(centerx=surface_w // 2,
+                                        bottom=surface_h - 20)  # 20 pixels from the bottom
+
+def initialize_menu(surface):
+    global menu_initialized, start_time, current_frame, last_frame_time, last_prompt_step, menu_load_time
+
+    menu_load_time = game_clock.get_ticks()
+
+    # Bake the frames now unless the loading screen already did
+    if menu_frames is None:
+        prepare_menu(surface)
 
     # Record start time for animations
-    start_time = pygame.time.get_ticks()
+    start_time = game_clock.get_ticks()
 
     # Initialize animation variables
     current_frame = 0
-    last_frame_time = pygame.time.get_ticks()
+    last_frame_time = game_clock.get_ticks()
+    last_prompt_step = None
 
     menu_initialized = True
 
 def handle_menu_drawing(surface):
-    global menu_initialized, start_time, current_frame, last_frame_time, menu_frames, logo_image
+    global current_frame, last_frame_time, last_prompt_step
 
     # Initialize menu if not already done
     if not menu_initialized:
-        initialize_menu()
-
-    # Clear the surface
-    surface.fill((0, 0, 0))
+        initialize_menu(surface)
 
     # Update the current frame every 150ms
-    current_time = pygame.time.get_ticks()
+    current_time = game_clock.get_ticks()
     if current_time - last_frame_time > 150:
         current_frame = (current_frame + 1) % len(menu_frames)
         last_frame_time = current_time
+        dirty_regions.mark_all()
 
-    # Scale the current frame to fit the surface
-    scaled_frame = pygame.transform.scale(menu_frames[current_frame],
-                                        (surface.get_width(), surface.get_height()))
-
-    # Draw the current frame
-    surface.blit(scaled_frame, (0, 0))
-
-    # Draw the logo at 1:1 scale over the background
-    surface.blit(logo_image, (0, 0))
+    # Draw the current frame, logo and captions included
+    surface.blit(menu_frames[current_frame], (0, 0))
 
     # Calculate the text opacity (oscillating between 50% and 100%)
     time_passed = (current_time - start_time) / 1000  # Convert to seconds
 
-    # Use sine wave to oscillate alpha from 128 to 255 (50% to 100% opacity)
-    alpha = int(128 + 127 * math.sin(time_passed * 2) ** 2)
-
-    # Create text surface
-    text_surface = font.render("Press Spacebar to start", True, (255, 255, 255))
-
-    # Create a surface with per-pixel alpha
-    text_surface_alpha = pygame.Surface(text_surface.get_size(), pygame.SRCALPHA)
-
-    # Blit the text onto the alpha surface with the calculated alpha
-    text_surface_alpha.fill((255, 255, 255, alpha))
-    text_surface_alpha.blit(text_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-
-    # Position the text at the lower portion of the screen
-    text_rect = text_surface.get_rect(centerx=surface.get_width() // 2,
-                                    bottom=surface.get_height() - 20)  # 20 pixels from the bottom
-
-    title_text = font.render("team blahajtron 2025", True, (255, 255, 255))
-    title_rect = title_text.get_rect(topright=(surface.get_width() - 5, 5))
-    surface.blit(title_text, title_rect)
-    title_text = font.render("kogni hackathon", True, (255, 255, 255))
-    title_rect = title_text.get_rect(topright=(surface.get_width() - 5, 15))
-    surface.blit(title_text, title_rect)
+    # Use sine wave to pick one of the precomputed steps from 128 to 255 (50% to 100% opacity)
+    prompt_step = round((PROMPT_ALPHA_STEPS - 1) * math.sin(time_passed * 2) ** 2)
 
     # Draw the text with fading effect
-    surface.blit(text_surface_alpha, text_rect)
+    surface.blit(prompt_steps[prompt_step], prompt_rect)
+    if prompt_step != last_prompt_step:
+        dirty_regions.mark(prompt_rect)
+        last_prompt_step = prompt_step
@@ -0,0 +1,220 @@
+"""Seeded procedural levels: walled rooms joined by corridors, furnished with tables and paper stacks
+
+    python -m src.mapgen              # benchmark generation of 256x256 and 1024x1024 maps
+    python -m src.mapgen 2048 4096    # or any other sizes
+"""
+import numpy as np
+from src.level import Level
+from src.tile import TILE_IDS
+from src.tiletype import TileType
+
+ROOM_MIN_SIZE = 6    # Smallest room side, walls included
+ROOM_MAX_SIZE = 16   # Largest room side, walls included
+ROOM_GAP = 2         # Empty tiles kept between rooms
+CORRIDOR_BAND = 48   # Rooms are joined in a snake order through horizontal bands this tall
+TABLE_AREA = 40      # One table cluster per this many floor tiles of a room
+PAPER_CHANCE = 0.02  # Chance for a free floor tile to get a paper stack
+ENEMY_AREA = 100     # One enemy per this many floor tiles, the start room stays empty
+
+CARPET = TILE_IDS[TileType.CARPET]
+PAPERSTACK = TILE_IDS[TileType.PAPERSTACK]
+TABLE = [[TILE_IDS[TileType.TABLE_TL], TILE_IDS[TileType.TABLE_TR]],
+         [TILE_IDS[TileType.TABLE_BL], TILE_IDS[TileType.TABLE_BR]]]
+
+# Tile IDs of the wall pieces of each room style
+WALL_STYLES = [
+    {
+        "top": TILE_IDS[TileType.WALL01], "bottom": TILE_IDS[TileType.WALL_DOWN],
+        "left": TILE_IDS[TileType.WALL_L], "right": TILE_IDS[TileType.WALL_R],
+        "top_left": TILE_IDS[TileType.WALL_CUL], "top_right": TILE_IDS[TileType.WALL_CUR],
+        "bottom_left": TILE_IDS[TileType.WALL_CLL], "bottom_right": TILE_IDS[TileType.WALL_CLR],
+        "door": TILE_IDS[TileType.WALL_DOOR],
+    },
+    {
+        "top": TILE_IDS[TileType.WALL02], "bottom": TILE_IDS[TileType.WALL02_DOWN],
+        "left": TILE_IDS[TileType.WALL02_L], "right": TILE_IDS[TileType.WALL02_R],
+        "top_left": TILE_IDS[TileType.WALL02_CUL], "top_right": TILE_IDS[TileType.WALL02_CUR],
+        "bottom_left": TILE_IDS[TileType.WALL02_CLL], "bottom_right": TILE_IDS[TileType.WALL02_CLR],
+        "door": TILE_IDS[TileType.WALL02_DOOR],
+    },
+]
+
+class GeneratedMap:
+    """Tile IDs (height x width uint8 array) of a generated map and where things go on it"""
+    def __init__(self, tiles, rooms, spawn, door, enemies):
+        self.tiles = tiles
+        self.rooms = rooms        # (x, y, width, height, style) of every room, walls included
+        self.spawn = spawn        # Player start tile
+        self.door = door          # Exit door tile
+        self.enemies = enemies    # Enemy tiles
+
+def place_rooms(rng, width, height):
+    """Scatters non-overlapping rooms, returns them as (x, y, width, height, style)"""
+    attempts = max(8, width * height // 64)
+    # Every candidate room is drawn up front, then kept if it doesn't overlap the ones kept before it
+    sizes = rng.integers(ROOM_MIN_SIZE, ROOM_MAX_SIZE + 1, size=(attempts, 2))
+    sizes = sizes[(sizes[:, 0] <= width - 2) & (sizes[:, 1] <= height - 2)]
+    xs = 1 + (rng.random(len(sizes)) * (width - 1 - sizes[:, 0])).astype(np.int64)
+    ys = 1 + (rng.random(len(sizes)) * (height - 1 - sizes[:, 1])).astype(np.int64)
+    styles = rng.integers(len(WALL_STYLES), size=len(sizes))
+
+    taken = np.zeros((height, width), dtype=bool)
+    rooms = []
+    for x, y, (room_w, room_h), style in zip(xs.tolist(), ys.tolist(), sizes.tolist(), styles.tolist()):
+        # Rooms keep a gap around them so corridors can pass in between
+        area = (slice(max(0, y - ROOM_GAP), y + room_h + ROOM_GAP),
+                slice(max(0, x - ROOM_GAP), x + room_w + ROOM_GAP))
+        if taken[area].any():
+            continue
+        taken[area] = True
+        rooms.append((x, y, room_w, room_h, style))
+    return rooms
+
+def build_room(tiles, room):
+    x, y, room_w, room_h, style = room
+    walls = WALL_STYLES[style]
+    right, bottom = x + room_w - 1, y + room_h - 1
+    tiles[y + 1:bottom, x + 1:right] = CARPET
+    tiles[y, x:right] = walls["top"]
+    tiles[bottom, x:right] = walls["bottom"]
+    tiles[y:bottom, x] = walls["left"]
+    tiles[y:bottom, right] = walls["right"]
+    tiles[y, x] = walls["top_left"]
+    tiles[y, right] = walls["top_right"]
+    tiles[bottom, x] = walls["bottom_left"]
+    tiles[bottom, right] = walls["bottom_right"]
+
+def room_center(room):
+    x, y, room_w, room_h, _ = room
+    return x + room_w // 2, y + room_h // 2
+
+def snake_order(rooms):
+    """Orders rooms row band by row band, alternating direction, so neighbours in the list are close"""
+    def key(room):
+        center_x, center_y = room_center(room)
+        band = center_y // CORRIDOR_BAND
+        return band, center_x if band % 2 == 0 else -center_x
+    return sorted(rooms, key=key)
+
+def carve_corridor(tiles, corridors, start, end, horizontal_first):
+    """Digs an L-shaped corridor of carpet between two tiles, opening any wall in the way"""
+    (x0, y0), (x1, y1) = start, end
+    corner = (x1, y0) if horizontal_first else (x0, y1)
+    for (ax, ay), (bx, by) in ((start, corner), (corner, end)):
+        area = (slice(min(ay, by), max(ay, by) + 1), slice(min(ax, bx), max(ax, bx) + 1))
+        tiles[area] = CARPET
+        corridors[area] = True
+
+def furnish_room(rng, tiles, blocked, room):
+    """Places table clusters with a free tile around each, so they never cut the room in two"""
+    x, y, room_w, room_h, _ = room
+    floor_area = (room_w - 2) * (room_h - 2)
+    for _ in range(floor_area // TABLE_AREA):
+        if room_w < 6 or room_h < 6:
+            break
+        table_x = int(rng.integers(x + 2, x + room_w - 3))
+        table_y = int(rng.integers(y + 2, y + room_h - 3))
+        ring = (slice(table_y - 1, table_y + 3), slice(table_x - 1, table_x + 3))
+        if blocked[ring].any() or (tiles[ring] != CARPET).any():
+            continue
+        tiles[table_y:table_y + 2, table_x:table_x + 2] = TABLE
+        blocked[ring] = True
+
+def generate_map(width, height, seed=None):
+    """Generates a width x height map, the same seed always gives the same map"""
+    rng = np.random.default_rng(seed)
+    tiles = np.zeros((height, width), dtype=np.uint8)
+
+    rooms = place_rooms(rng, width, height)
+    if not rooms:
+        raise ValueError(f"a {width}x{height} map is too small for a room")
+    for room in rooms:
+        build_room(tiles, room)
+
+    # Join every room to the next one along the snake so the whole map is connected
+    rooms = snake_order(rooms)
+    corridors = np.zeros((height, width), dtype=bool)
+    for room, next_room in zip(rooms, rooms[1:]):
+        carve_corridor(tiles, corridors, room_center(room), room_center(next_room), bool(rng.integers(2)))
+
+    # The player starts in the first room and leaves through a door in the last one's top wall
+    spawn = room_center(rooms[0])
+    exit_x, exit_y, exit_w, _, exit_style = rooms[-1]
+    # The door goes as close to the middle of the wall as it can without blocking a corridor
+    door_x = min((x for x in range(exit_x + 1, exit_x + exit_w - 1) if not corridors[exit_y, x]),
+                 key=lambda x: abs(x - (exit_x + exit_w // 2)), default=exit_x + exit_w // 2)
+    door = (door_x, exit_y)
+    tiles[door[1], door[0]] = WALL_STYLES[exit_style]["door"]
+    tiles[door[1] + 1, door[0]] = CARPET
+
+    # Corridors, the spawn and the tile in front of the door are kept clear of furniture
+    blocked = corridors.copy()
+    blocked[spawn[1], spawn[0]] = True
+    blocked[door[1] + 1, door[0]] = True
+    for room in rooms:
+        furnish_room(rng, tiles, blocked, room)
+
+    # Paper stacks can be walked over, so they may go on any free floor tile
+    papers = (tiles == CARPET) & ~blocked & (rng.random((height, width)) < PAPER_CHANCE)
+    tiles[papers] = PAPERSTACK
+
+    enemies = []
+    for x, y, room_w, room_h, _ in rooms[1:]:
+        floor_y, floor_x = np.nonzero(tiles[y + 1:y + room_h - 1, x + 1:x + room_w - 1] == CARPET)
+        count = min(len(floor_x), int(rng.poisson(len(floor_x) / ENEMY_AREA)))
+        for i in rng.choice(len(floor_x), size=count, replace=False).tolist():
+            enemies.append((x + 1 + int(floor_x[i]), y + 1 + int(floor_y[i])))
+
+    return GeneratedMap(tiles, rooms, spawn, door, enemies)
+
+def build_level(generated, clock=None):
+    """Creates the Level for a generated map, with its enemies"""
+    height, width = generated.tiles.shape
+    level = Level(width, height, clock=clock)
+    level.set_tiles(generated.tiles)
+    level.spawn = generated.spawn
+    level.door = generated.door
+    for x, y in generated.enemies:
+        level.add_enemy(x, y)
+    return level
+
+def make_generated_level(width=64, height=64, seed=None, clock=None):
+    return build_level(generate_map(width, height, seed), clock)
+
+def benchmark(size, seed=0):
+    """Times generating a size x size level and its first flow field, then measures their memory in a second run"""
+    import time
+    import tracemalloc
+
+    start_time = time.perf_counter()
+    generated = generate_map(size, size, seed)
+    generated_time = time.perf_counter()
+    level = build_level(generated)
+    built_time = time.perf_counter()
+    level.add_player(*level.spawn)
+    level.get_flow_field()
+    field_time = time.perf_counter()
+    rooms, enemies = len(generated.rooms), len(level.enemies)
+    del generated, level
+
+    # Tracing slows allocations down, so memory is measured separately from time
+    tracemalloc.start()
+    generated = generate_map(size, size, seed)
+    level = build_level(generated)
+    level.add_player(*level.spawn)
+    level.get_flow_field()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"size": size, "rooms": rooms, "enemies": enemies,
+            "generate_ms": (generated_time - start_time) * 1000, "level_ms": (built_time - generated_time) * 1000,
+            "field_ms": (field_time - built_time) * 1000, "memory_mb": current / 2**20, "peak_mb": peak / 2**20}
+
+if __name__ == "__main__":
+    import sys
+
+    for map_size in [int(arg) for arg in sys.argv[1:]] or [256, 1024]:
+        result = benchmark(map_size)
+        print(f"{result['size']}x{result['size']}: {result['rooms']} rooms generated in {result['generate_ms']:.0f} ms, "
+              f"level with {result['enemies']} enemies built in {result['level_ms']:.0f} ms, "
+              f"first flow field in {result['field_ms']:.1f} ms, "
+              f"{result['memory_mb']:.1f} MB held ({result['peak_mb']:.1f} MB peak)")
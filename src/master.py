@@ -2,14 +2,35 @@ import pygame
 import sys
 from src.cutscene import CutsceneHandler
 import src.intro as intro
+import src.loading as loading
 import src.mainmenu as mainmenu
 import src.levels as levels
 from src.gamestate import gamestate
+from src.display import dirty_regions, Presenter
 from src.cutscene import opening_cutscene_dialogue
 from src.cutscene import final_cutscene_dialogue
-from src.levels import make_lvl_1
-
-def main():
+from src.common import load_font
+from src.clock import game_clock, SIM_STEP_MS
+
+# A slow machine runs several steps per rendered frame and keeps game speed, only a frame longer
+# than this (a stall such as dragging the window) has the rest of its time dropped
+MAX_FRAME_MS = 250
+
+def load_level(number, view_size):
+    """Builds level number with its player and camera in place"""
+    if number == 1:
+        level = levels.make_lvl_1()
+    elif number == 2:
+        level = levels.make_lvl_2()
+    elif number == 3:
+        level = levels.make_lvl_3()
+    level.level_number = number
+
+    level.add_player(*level.spawn)
+    level.init_camera(*view_size)
+    return level
+
+def main(dirty_rects=False, max_fps=60):
     pygame.init()
 
     window_w, window_h = 256*4, 240*4
@@ -18,28 +39,49 @@ def main():
 
     pygame.key.set_repeat(96, 32)
 
-    font = pygame.font.Font("./assets/Micro_Chat.ttf", 10)
+    dirty_regions.enabled = dirty_rects
+
+    font = load_font(10)
 
     game_w, game_h = 256, 240
-    game_surface = pygame.Surface((game_w, game_h))
+    game_surface = pygame.Surface((game_w, game_h)).convert()
+    presenter = Presenter(game_surface)
 
-    scaled_w, scaled_h = game_w, game_h
-    pos_x, pos_y = 0, 0
     last_window_size = (0, 0)
+    last_screen = None
 
     running = True
     clock = pygame.time.Clock()
+    accumulator = 0.0
 
-    level = make_lvl_1()
-    # level.add_player(1, 1)
-    # level.init_camera(game_w, game_h)
+    # The first level is built on the loading screen, later ones when the player reaches them
+    level = None
+    running_level = None
 
-    gamestate.screen = "introvideo"
+    gamestate.screen = "loading"
 
     opening_cutscene = CutsceneHandler(opening_cutscene_dialogue)
     final_cutscene = CutsceneHandler(final_cutscene_dialogue)
 
+    def prepare_first_level(surface):
+        nonlocal level
+        level = load_level(1, (game_w, game_h))
+        # Drawing once rasterizes the tiles in view and renders the HUD text
+        level.draw(surface, font)
+
+    loading.PREPARE_TASKS.extend([
+        lambda surface: opening_cutscene.get_page(0, surface.get_size()),
+        lambda surface: final_cutscene.get_page(0, surface.get_size()),
+        prepare_first_level,
+    ])
+
     while running:
+        # Real time since the last frame, it fills the step accumulator in game
+        frame_ms = game_clock.frame_time()
+        if gamestate.screen != "ingame":
+            # Outside the game, game time simply follows the frames
+            game_clock.tick(frame_ms)
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -56,32 +98,36 @@ def main():
                     opening_cutscene.handle_events(event)
                 elif gamestate.screen == "finalcutscene":
                     final_cutscene.handle_events(event)
-                elif gamestate.screen == "ingame":
+                elif gamestate.screen == "ingame" and level is not None:
                     level.conductor.start() # this is a silly... and danger...
                     level.handle_player_movement(event)
 
         if gamestate.screen == "ingame":
+            accumulator += min(frame_ms, MAX_FRAME_MS)
 
-            if level is None or getattr(level, 'level_number', -1) != gamestate.current_level:
+            if level is None or level.level_number != gamestate.current_level:
                 # Load new level based on current_level
-                if gamestate.current_level == 1:
-                    level = levels.make_lvl_1()
-                    level.level_number = 1
-                elif gamestate.current_level == 2:
-                    level = levels.make_lvl_2()
-                    level.level_number = 2
-                elif gamestate.current_level == 3:
-                    level = levels.make_lvl_3()
-                    level.level_number = 3
-
-                # Initialize level
-                level.add_player(1, 1)
-                level.init_camera(game_w, game_h)
+                level = load_level(gamestate.current_level, (game_w, game_h))
+
+            if level is not running_level:
+                # Start the level the first time it is shown
+                running_level = level
                 level.conductor.start()
 
-            level.update()
-            if level.check_level_completion():
-                level.transition_to_next_level()
+                # Always simulate one step before the first draw
+                accumulator = SIM_STEP_MS
+
+            # Run as many fixed steps as the elapsed time covers
+            while accumulator >= SIM_STEP_MS:
+                # Every step moves game time by exactly one step
+                game_clock.tick(SIM_STEP_MS)
+                level.update()
+                accumulator -= SIM_STEP_MS
+                if level.check_level_completion():
+                    level.transition_to_next_level()
+                    break
+        else:
+            accumulator = 0.0
 
 
         # UPDATE CALLS
@@ -90,21 +136,19 @@ def main():
 
         current_window_size = (window_w, window_h)
         if current_window_size != last_window_size:
-            scale_w = window_w / game_w
-            scale_h = window_h / game_h
-            scale_factor = min(scale_w, scale_h)
-
-            scaled_w = int(game_w * scale_factor)
-            scaled_h = int(game_h * scale_factor)
-
-            pos_x = (window_w - scaled_w) // 2
-            pos_y = (window_h - scaled_h) // 2
-
+            presenter.resize(window)
             last_window_size = current_window_size
+            dirty_regions.mark_all()
+
+        if gamestate.screen != last_screen:
+            dirty_regions.mark_all()
+            last_screen = gamestate.screen
 
         game_surface.fill((0, 0, 0))
 
-        if gamestate.screen == "introvideo":
+        if gamestate.screen == "loading":
+            loading.handle_loading_drawing(game_surface)
+        elif gamestate.screen == "introvideo":
             intro.handle_intro_drawing(game_surface)
         elif gamestate.screen == "mainmenu":
             mainmenu.handle_menu_drawing(game_surface)
@@ -113,14 +157,15 @@ def main():
         elif gamestate.screen == "finalcutscene":
             final_cutscene.draw(game_surface)
         elif gamestate.screen == "ingame":
-            level.draw(game_surface, font)
-
-        window.fill((0, 0, 0))
-        scaled_surface = pygame.transform.scale(game_surface, (scaled_w, scaled_h))
-        window.blit(scaled_surface, (pos_x, pos_y))
-
-        pygame.display.flip()
-        clock.tick(60)
+            # Draw in between the last two simulation steps, time left over after completing a level isn't drawn ahead
+            level.draw(game_surface, font, min(1.0, accumulator / SIM_STEP_MS))
+
+        if dirty_rects:
+            # Only scale and present the regions the scenes reported as changed
+            presenter.present_regions(dirty_regions.take(game_surface.get_rect()))
+        else:
+            presenter.present()
+        clock.tick(max_fps)
 
     pygame.quit()
     sys.exit()
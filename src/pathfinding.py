@@ -0,0 +1,176 @@
+import heapq
+
+# Only cardinal directions (NO DIAGONALS)
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+UNREACHED = 255  # DistanceField value of cells further than its limit or cut off from the goal
+
+class GridPathfinder:
+    """A* over a 4-connected width x height grid of cell indices (y * width + x)
+
+    Score and parent arrays are allocated by the first search and reused by every later one, a
+    generation counter marks which entries belong to the current search so nothing is cleared in between.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.g_score = None
+        self.came_from = None
+        self.seen = None    # generation in which the cell was last reached
+        self.closed = None  # generation in which the cell was last expanded
+        self.generation = 0
+
+    def allocate(self):
+        size = self.width * self.height
+        self.g_score = [0] * size
+        self.came_from = [-1] * size
+        self.seen = [0] * size
+        self.closed = [0] * size
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def position(self, index):
+        return index % self.width, index // self.width
+
+    def find_path(self, start, goal, passable):
+        """Returns the cell indices from start (excluded) to goal, or [] if there is no path
+
+        passable(index) tells whether a cell may be entered.
+        """
+        if start == goal:
+            return []
+        if self.g_score is None:
+            self.allocate()
+
+        self.generation += 1
+        generation = self.generation
+        width = self.width
+        height = self.height
+        g_score = self.g_score
+        came_from = self.came_from
+        seen = self.seen
+        closed = self.closed
+        goal_x, goal_y = goal % width, goal // width
+
+        g_score[start] = 0
+        came_from[start] = -1
+        seen[start] = generation
+        start_x, start_y = start % width, start // width
+        open_set = [(abs(start_x - goal_x) + abs(start_y - goal_y), start)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if closed[current] == generation:
+                continue  # Stale entry, the cell was already expanded with a better score
+            if current == goal:
+                return self.reconstruct_path(current)
+            closed[current] = generation
+
+            x, y = current % width, current // width
+            next_g = g_score[current] + 1  # Cost is 1 for each step
+
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if closed[neighbor] == generation:
+                    continue
+                if seen[neighbor] == generation and next_g >= g_score[neighbor]:
+                    continue
+                if not passable(neighbor):
+                    continue
+
+                seen[neighbor] = generation
+                g_score[neighbor] = next_g
+                came_from[neighbor] = current
+                heapq.heappush(open_set, (next_g + abs(nx - goal_x) + abs(ny - goal_y), neighbor))
+
+        # No path found
+        return []
+
+    def reconstruct_path(self, current):
+        path = []
+        while self.came_from[current] != -1:
+            path.append(current)
+            current = self.came_from[current]
+        path.reverse()
+        return path
+
+class DistanceField:
+    """Breadth-first step counts to a goal over a 4-connected width x height grid, one byte per cell
+
+    The search stops at max_distance (below UNREACHED), so its cost depends on the area
+    searched rather than the grid size, and every cell further away stays UNREACHED.
+    """
+    def __init__(self, width, height, max_distance):
+        if not 0 <= max_distance < UNREACHED:
+            raise ValueError(f"max_distance must be below {UNREACHED}, got {max_distance}")
+        self.width = width
+        self.height = height
+        self.max_distance = max_distance
+        self.distance = bytearray([UNREACHED]) * (width * height)
+        self.reached = []  # Cells set by the last search
+
+    def search(self, goal, passable):
+        """Fills the field with step counts to goal, returns the distance bytearray
+
+        passable(index) tells whether a cell may be entered. The bytearray is reused and
+        overwritten by the next search.
+        """
+        width = self.width
+        height = self.height
+        max_distance = self.max_distance
+        distance = self.distance
+        # Only the cells reached by the previous search need resetting
+        for index in self.reached:
+            distance[index] = UNREACHED
+
+        distance[goal] = 0
+        reached = [goal]
+        head = 0
+        while head < len(reached):
+            current = reached[head]
+            head += 1
+            next_distance = distance[current] + 1
+            if next_distance > max_distance:
+                break  # Cells are reached in distance order, everything left is as far
+            x, y = current % width, current // width
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if distance[neighbor] == UNREACHED and passable(neighbor):
+                    distance[neighbor] = next_distance
+                    reached.append(neighbor)
+        self.reached = reached
+        return distance
+
+def benchmark(size, searches=20, wall_chance=0.25, seed=0):
+    """Times searches between random open cells of a size x size grid with random walls"""
+    import random
+    import time
+
+    rng = random.Random(seed)
+    walls = bytearray(1 if rng.random() < wall_chance else 0 for _ in range(size * size))
+    open_cells = [i for i, wall in enumerate(walls) if not wall]
+    pathfinder = GridPathfinder(size, size)
+
+    def passable(index):
+        return not walls[index]
+
+    found = 0
+    start_time = time.perf_counter()
+    for _ in range(searches):
+        if pathfinder.find_path(rng.choice(open_cells), rng.choice(open_cells), passable):
+            found += 1
+    elapsed = time.perf_counter() - start_time
+    return {"size": size, "searches": searches, "found": found,
+            "ms_per_search": elapsed * 1000 / searches}
+
+if __name__ == "__main__":
+    for grid_size, count in ((100, 200), (500, 20)):
+        result = benchmark(grid_size, count)
+        print(f"{result['size']}x{result['size']}: {result['ms_per_search']:.2f} ms per search "
+              f"({result['found']}/{result['searches']} paths found)")
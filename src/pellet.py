@@ -1,52 +1,153 @@
-import pygame
-from src.common import TILE_SIZE, load_texture
-
-class Pellet:
-    def __init__(self, start_x, start_y, direction, speed=5):
-        self.x = start_x
-        self.y = start_y
-        self.direction = direction  # (dx, dy) normalized direction vector
-        self.speed = speed
-        self.active = True
-        self.damage = 1
-        self.lifetime = 2000  # 2 seconds lifetime
-        self.spawn_time = pygame.time.get_ticks()
-
-        # Choose a random pellet texture (1-4)
-        pellet_num = (pygame.time.get_ticks() % 4) + 1
-        self.texture = load_texture(f"./assets/textures/pellet{pellet_num}.png")
-
-    def update(self):
-        # Move the pellet
-        self.x += self.direction[0] * self.speed
-        self.y += self.direction[1] * self.speed
-
-        # Check if pellet has exceeded its lifetime
-        if pygame.time.get_ticks() - self.spawn_time > self.lifetime:
-            self.active = False
-
-    def check_collision(self, enemy):
-        # Get pellet position in tile coordinates
-        pellet_tile_x = int(self.x / TILE_SIZE)
-        pellet_tile_y = int(self.y / TILE_SIZE)
-
-        # Check if pellet is in same tile as enemy
-        if pellet_tile_x == enemy.tile_x and pellet_tile_y == enemy.tile_y:
-            self.active = False
-            return True
-        return False
-
-    def draw(self, surface, camera_x, camera_y):
-        # Draw the pellet at its current position
-        draw_x = int(self.x - camera_x)
-        draw_y = int(self.y - camera_y)
-
-        # Scale texture to appropriate size (half tile size)
-        size = TILE_SIZE // 2
-        scaled_texture = pygame.transform.scale(self.texture, (size, size))
-
-        # Center the pellet in its position
-        centered_x = draw_x - size // 2
-        centered_y = draw_y - size // 2
-
-        surface.blit(scaled_texture, (centered_x, centered_y))
+import numpy as np
+from src.common import TILE_SIZE, load_scaled_texture
+from src.clock import game_clock
+
+PELLET_LIFETIME = 2000  # 2 seconds lifetime
+PELLET_SPEED = 5
+PELLET_SIZE = TILE_SIZE // 2
+
+# Per-pellet fields, each stored as one array
+PELLET_FIELDS = {
+    "x": np.float64, "y": np.float64,
+    "prev_x": np.float64, "prev_y": np.float64,  # Position at the previous simulation step
+    "dx": np.float64, "dy": np.float64,  # Normalized direction vector
+    "speed": np.float64,
+    "spawn_time": np.int64,
+    "texture": np.int8,
+}
+
+class PelletSystem:
+    """All pellets of a level, stored as parallel NumPy arrays and updated in batch
+
+    Every array, including the scratch space update() works in, is allocated up front
+    and reused, so firing and expiring pellets doesn't allocate anything per step.
+    """
+    def __init__(self, clock=None, capacity=64):
+        self.clock = clock or game_clock
+        self.count = 0
+        self.capacity = 0
+
+        # Pellet textures (1-4), pre-scaled to half tile size, resolved once for the whole pool
+        self.textures = [load_scaled_texture(f"./assets/textures/pellet{i}.png", (PELLET_SIZE, PELLET_SIZE))
+                         for i in range(1, 5)]
+
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """(Re)allocates the arrays, keeping the first count pellets"""
+        for name, dtype in PELLET_FIELDS.items():
+            array = np.zeros(capacity, dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        # Second set of field arrays, compact() packs into it and swaps it in
+        self.spare = {name: np.zeros(capacity, dtype) for name, dtype in PELLET_FIELDS.items()}
+
+        # Scratch space for update()
+        self.step = np.zeros(capacity, np.float64)
+        self.tile_x = np.zeros(capacity, np.int64)
+        self.tile_y = np.zeros(capacity, np.int64)
+        self.tile_index = np.zeros(capacity, np.int64)
+        self.tile_flags = np.zeros(capacity, np.uint8)
+        self.active = np.zeros(capacity, bool)
+        self.hits = np.zeros(capacity, bool)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, y, direction, speed=PELLET_SPEED):
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        i = self.count
+        now = self.clock.get_ticks()
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.dx[i], self.dy[i] = direction
+        self.speed[i] = speed
+        self.spawn_time[i] = now
+        # Choose a pseudo-random pellet texture
+        self.texture[i] = now % 4
+        self.count += 1
+
+    def update(self, level):
+        """Moves every pellet and removes the ones that expired, hit a wall or hit an enemy"""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        step = self.step[:n]
+        tile_x, tile_y, tile_index = self.tile_x[:n], self.tile_y[:n], self.tile_index[:n]
+        tile_flags, active, hits = self.tile_flags[:n], self.active[:n], self.hits[:n]
+
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        # Move the pellets
+        x += np.multiply(self.dx[:n], self.speed[:n], out=step)
+        y += np.multiply(self.dy[:n], self.speed[:n], out=step)
+
+        # Pellets that exceeded their lifetime
+        np.greater_equal(self.spawn_time[:n], self.clock.get_ticks() - PELLET_LIFETIME, out=active)
+
+        # Tile coordinates, truncated toward zero like int()
+        np.copyto(tile_x, np.trunc(np.divide(x, TILE_SIZE, out=step), out=step), casting="unsafe")
+        np.copyto(tile_y, np.trunc(np.divide(y, TILE_SIZE, out=step), out=step), casting="unsafe")
+
+        # Out of bounds
+        active &= np.greater_equal(tile_x, 0, out=hits)
+        active &= np.less(tile_x, level.width, out=hits)
+        active &= np.greater_equal(tile_y, 0, out=hits)
+        active &= np.less(tile_y, level.height, out=hits)
+
+        # Pellets that are no longer active all look up tile 0
+        np.multiply(tile_y, level.width, out=tile_index)
+        tile_index += tile_x
+        tile_index *= active
+
+        # Hitting a wall
+        np.take(np.frombuffer(level.walkable, dtype=np.uint8), tile_index, out=tile_flags)
+        np.logical_and(active, tile_flags, out=active)
+
+        # Pellets on a tile with an enemy, resolved in spawn order so one kill isn't counted twice
+        np.take(np.frombuffer(level.occupied, dtype=np.uint8), tile_index, out=tile_flags)
+        np.logical_and(active, tile_flags, out=hits)
+        if hits.any():
+            for i in np.flatnonzero(hits).tolist():
+                enemy = level.enemy_at(int(tile_x[i]), int(tile_y[i]))
+                if enemy:
+                    active[i] = False
+                    # Enemy hit
+                    if enemy.take_damage():
+                        # Enemy killed
+                        level.remove_enemy(enemy)
+
+        if not active.all():
+            self.compact(active)
+
+    def compact(self, keep):
+        """Packs the pellets flagged in keep to the front, keeping their order"""
+        kept = int(np.count_nonzero(keep))
+        for name in PELLET_FIELDS:
+            array, spare = getattr(self, name), self.spare[name]
+            np.compress(keep, array[:self.count], out=spare[:kept])
+            # The packed copy becomes the live array, the old one is the next spare
+            setattr(self, name, spare)
+            self.spare[name] = array
+        self.count = kept
+
+    def draw(self, surface, camera_x, camera_y, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+        # Draw the pellets between their last two simulation positions, centered on them
+        draw_x = (self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha - camera_x).astype(np.int64) - PELLET_SIZE // 2
+        draw_y = (self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha - camera_y).astype(np.int64) - PELLET_SIZE // 2
+
+        # Only pellets that overlap the surface are blitted
+        visible = ((draw_x > -PELLET_SIZE) & (draw_x < surface.get_width()) &
+                   (draw_y > -PELLET_SIZE) & (draw_y < surface.get_height()))
+        textures = self.textures
+        surface.blits([(textures[t], (px, py)) for t, px, py in
+                       zip(self.texture[:n][visible].tolist(), draw_x[visible].tolist(), draw_y[visible].tolist())],
+                      False)
@@ -1,7 +1,8 @@
-import pygame
 import math
 from enum import Enum
-from src.common import TILE_SIZE, PLAYER_SIZE, load_texture
+from src.common import TILE_SIZE, PLAYER_SIZE, load_scaled_texture, render_text
+from src.soundbank import sound_bank
+from src.clock import game_clock
 
 class PlayerState(Enum):
     IDLE = 0
@@ -16,19 +17,23 @@ class PlayerDirection(Enum):
     LEFT = 3
 
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
+        self.clock = clock or game_clock
         self.tile_x = x
         self.tile_y = y
         self.starting_x = x  # Store starting position for respawn
         self.starting_y = y
         self.pixel_x = x * TILE_SIZE
         self.pixel_y = y * TILE_SIZE
+        self.prev_pixel_x = self.pixel_x  # Position at the previous simulation step
+        self.prev_pixel_y = self.pixel_y
 
-        # Load textures
-        self.texture_down = load_texture("./assets/textures/student01.png")
-        self.texture_left = load_texture("./assets/textures/student_l.png")
-        self.texture_right = pygame.transform.flip(self.texture_left, True, False)
-        self.texture_up = load_texture("./assets/textures/student_u.png")
+        # Load textures, pre-scaled to player size (16x16)
+        player_size = (PLAYER_SIZE, PLAYER_SIZE)
+        self.texture_down = load_scaled_texture("./assets/textures/student01.png", player_size)
+        self.texture_left = load_scaled_texture("./assets/textures/student_l.png", player_size)
+        self.texture_right = load_scaled_texture("./assets/textures/student_l.png", player_size, flip_x=True)
+        self.texture_up = load_scaled_texture("./assets/textures/student_u.png", player_size)
 
         # Health system
         self.max_health = 6
@@ -36,17 +41,14 @@ class Player:
         self.invulnerable = False
         self.invulnerable_time = 0
         self.invulnerable_duration = 1500  # 1.5 seconds of invulnerability after hit
-        self.brain_texture = load_texture("./assets/textures/mozg.png")  # Load brain texture for UI
+        self.brain_size = 16
+        self.brain_texture = load_scaled_texture("./assets/textures/mozg.png", (self.brain_size, self.brain_size))  # Load brain texture for UI
+        self.brain_texture_empty = load_scaled_texture("./assets/textures/mozg.png", (self.brain_size, self.brain_size), variant="faded")
         self.flash_timer = 0  # For hurt animation flashing
 
-        self.hit_sound = pygame.mixer.Sound("./assets/Hit10.wav")
-        self.hit_sound.set_volume(0.7)  # Adjust volume as needed
-
         self.pellets = 0
         self.max_pellets = 12  # Maximum pellets player can hold
-        self.pellet_textures = [load_texture(f"./assets/textures/pellet{i}.png") for i in range(1, 5)]
-        self.shoot_sound = pygame.mixer.Sound("./assets/Blip3.wav")  # Reuse existing sound or add new one
-        self.shoot_sound.set_volume(0.7)
+        self.pellet_textures = [load_scaled_texture(f"./assets/textures/pellet{i}.png", (8, 8)) for i in range(1, 5)]
 
         # Initial direction
         self.direction = PlayerDirection.DOWN
@@ -86,7 +88,7 @@ class Player:
 
         # Decrease pellet count and play sound
         self.pellets -= 1
-        self.shoot_sound.play()
+        sound_bank.play("./assets/Blip3.wav", "shots", 0.7)
 
         return True
 
@@ -112,9 +114,8 @@ class Player:
         #     self.pellets -= 1  # Decrease by 1 if 4 or less
 
     def draw_pellet_count(self, surface, font):
-        icon = pygame.transform.scale(self.pellet_textures[0], (8, 8))
-        surface.blit(icon, (6, 24))
-        count_text = font.render(f"x{self.pellets}", True, (255, 255, 255))
+        surface.blit(self.pellet_textures[0], (6, 24))
+        count_text = render_text(font, f"x{self.pellets}", (255, 255, 255))
         surface.blit(count_text, (18, 16))
 
     def move(self, dx, dy, level, on_beat=False):
@@ -141,26 +142,22 @@ class Player:
         new_y = self.tile_y + dy
 
         # Check if movement is valid
-        if (0 <= new_x < level.width and
-            0 <= new_y < level.height and
-            not level.get_tile(new_x, new_y).has_collision()):
+        if level.is_walkable(new_x, new_y):
 
             # Check for enemy collision BEFORE starting movement
-            if hasattr(level, 'enemies'):
-                for enemy in level.enemies:
-                    if enemy.tile_x == new_x and enemy.tile_y == new_y:
-                        # Just take damage but DON'T move into the enemy
-                        if self.take_damage(amount=1, level=level):
-                            # Check if player died from this collision
-                            if self.current_health <= 0:
-                                self.state = PlayerState.DEAD
-                        return False  # Cancel the movement entirely
+            if level.enemy_at(new_x, new_y):
+                # Just take damage but DON'T move into the enemy
+                if self.take_damage(amount=1, level=level):
+                    # Check if player died from this collision
+                    if self.current_health <= 0:
+                        self.state = PlayerState.DEAD
+                return False  # Cancel the movement entirely
 
             # No enemy collision, proceed with movement
             self.move_duration = 200  # Fixed duration for all moves
 
             self.state = PlayerState.MOVING
-            self.move_start_time = pygame.time.get_ticks()
+            self.move_start_time = self.clock.get_ticks()
             self.move_progress = 0.0
 
             self.source_x = self.tile_x
@@ -182,18 +179,18 @@ class Player:
             return False
 
         # Play hit sound effect
-        self.hit_sound.play()
+        sound_bank.play("./assets/Hit10.wav", "hits", 0.7)
 
         # Reduce health
         self.current_health -= amount
 
         # Play hurt sound or animation
         self.state = PlayerState.HURT
-        self.flash_timer = pygame.time.get_ticks()
+        self.flash_timer = self.clock.get_ticks()
 
         # Start invulnerability period
         self.invulnerable = True
-        self.invulnerable_time = pygame.time.get_ticks()
+        self.invulnerable_time = self.clock.get_ticks()
 
         # Push player in random direction if level is provided
         if level is not None:
@@ -213,10 +210,12 @@ class Player:
         self.tile_y = self.starting_y
         self.pixel_x = self.tile_x * TILE_SIZE
         self.pixel_y = self.tile_y * TILE_SIZE
+        self.prev_pixel_x = self.pixel_x
+        self.prev_pixel_y = self.pixel_y
         self.current_health = self.max_health
         self.state = PlayerState.IDLE
         self.invulnerable = True
-        self.invulnerable_time = pygame.time.get_ticks()
+        self.invulnerable_time = self.clock.get_ticks()
 
     def get_current_texture(self):
         # Return the appropriate texture based on direction
@@ -243,13 +242,11 @@ class Player:
             new_y = self.tile_y + dy
 
             # Verify the move is valid
-            if (0 <= new_x < level.width and
-                0 <= new_y < level.height and
-                not level.get_tile(new_x, new_y).has_collision()):
+            if level.is_walkable(new_x, new_y):
 
                 # Set up the movement
                 self.state = PlayerState.MOVING
-                self.move_start_time = pygame.time.get_ticks()
+                self.move_start_time = self.clock.get_ticks()
                 self.move_progress = 0.0
 
                 self.source_x = self.tile_x
@@ -269,7 +266,10 @@ class Player:
         return False
 
     def update(self):
-        current_time = pygame.time.get_ticks()
+        self.prev_pixel_x = self.pixel_x
+        self.prev_pixel_y = self.pixel_y
+
+        current_time = self.clock.get_ticks()
 
         # Update invulnerability status
         if self.invulnerable and current_time - self.invulnerable_time > self.invulnerable_duration:
@@ -329,16 +329,15 @@ class Player:
         should_draw = True
         if self.invulnerable:
             # Flash every 100ms while invulnerable
-            should_draw = (pygame.time.get_ticks() // 100) % 2 == 0
+            should_draw = (self.clock.get_ticks() // 100) % 2 == 0
 
         if should_draw:
-            # Scale to proper player size (16x16), not full tile size
-            scaled_texture = pygame.transform.scale(texture, (PLAYER_SIZE, PLAYER_SIZE))
-            surface.blit(scaled_texture, (centered_x, centered_y))
+            # Textures are already scaled to player size (16x16), not full tile size
+            surface.blit(texture, (centered_x, centered_y))
 
     def draw_health(self, surface):
         """Draw the health UI with brain icons"""
-        brain_size = 16
+        brain_size = self.brain_size
         padding = 4
         start_x = 4
         start_y = 4
@@ -347,15 +346,10 @@ class Player:
         for i in range(self.max_health):
             brain_x = start_x + i * (brain_size + padding)
 
-            # Scale the brain texture
-            scaled_brain = pygame.transform.scale(self.brain_texture, (brain_size, brain_size))
-
             if i < self.current_health:
                 # Draw full brain for current health
-                surface.blit(scaled_brain, (brain_x, start_y))
+                surface.blit(self.brain_texture, (brain_x, start_y))
             else:
                 # Draw empty outline for lost health
-                # Create a slightly transparent version for empty slots
-                empty_brain = scaled_brain.copy()
-                empty_brain.set_alpha(80)  # Make semi-transparent
-                surface.blit(empty_brain, (brain_x, start_y))
+                # Semi-transparent version for empty slots
+                surface.blit(self.brain_texture_empty, (brain_x, start_y))
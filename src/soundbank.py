@@ -0,0 +1,57 @@
+import pygame
+from src.common import load_sound
+
+# Channels reserved per category, so a flood of hits can never steal the metronome's channel
+SOUND_CATEGORIES = {
+    "metronome": 1,
+    "hits": 4,
+    "shots": 2,
+}
+MAX_VOICES_PER_SOUND = 3  # How many copies of one sound may play at the same time
+FREE_CHANNELS = 8  # Left unreserved for Sound.play() callers such as the intro music
+
+class SoundBank:
+    """Plays shared Sound objects on per-category channel pools with a voice limit"""
+    def __init__(self):
+        self.channels = None
+        self.playing = {}  # channel -> path of the last sound started on it
+        self.stats = {"played": 0, "dropped": 0}
+
+    def setup(self):
+        reserved = sum(SOUND_CATEGORIES.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + FREE_CHANNELS))
+        pygame.mixer.set_reserved(reserved)
+
+        self.channels = {}
+        next_channel = 0
+        for category, count in SOUND_CATEGORIES.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(next_channel, next_channel + count)]
+            next_channel += count
+
+    def play(self, path, category, volume=1.0):
+        """Plays the sound on a free channel of its category, returns the Channel or None if dropped"""
+        if not pygame.mixer.get_init():
+            return None
+        if self.channels is None:
+            self.setup()
+
+        free_channel = None
+        voices = 0
+        for channel in self.channels[category]:
+            if channel.get_busy():
+                if self.playing.get(channel) == path:
+                    voices += 1
+            elif free_channel is None:
+                free_channel = channel
+
+        if free_channel is None or voices >= MAX_VOICES_PER_SOUND:
+            self.stats["dropped"] += 1
+            return None
+
+        free_channel.set_volume(volume)
+        free_channel.play(load_sound(path))
+        self.playing[free_channel] = path
+        self.stats["played"] += 1
+        return free_channel
+
+sound_bank = SoundBank()
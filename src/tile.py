@@ -1,4 +1,5 @@
-import pygame
+from src.common import load_scaled_texture
+from src.tiletype import TileType
 
 class Tile:
     def __init__(self, tile_type):
@@ -11,8 +12,14 @@ class Tile:
         return self.tile_type.spawn_enemies
 
     def draw(self, surface, x, y, tile_size):
-        texture = self.tile_type.texture
-        # Scale with 1 extra pixel to prevent gaps
-        scaled_texture = pygame.transform.scale(texture, (tile_size, tile_size))
+        scaled_texture = load_scaled_texture(self.tile_type.texture_path, (tile_size, tile_size))
         # Ensure integer coordinates
         surface.blit(scaled_texture, (int(x), int(y)))
+
+
+# Tile-type table, levels store a table index (tile ID) per cell, 0 is an empty cell.
+# The Tile entries are shared by every cell of that type.
+TILE_TABLE = [None] + [Tile(tile_type) for tile_type in TileType]
+TILE_IDS = {tile.tile_type: tile_id for tile_id, tile in enumerate(TILE_TABLE) if tile}
+# 1 for tile IDs that can be walked on, indexed by tile ID
+TILE_WALKABLE = bytes(tile is not None and not tile.has_collision() for tile in TILE_TABLE)
@@ -0,0 +1,136 @@
+"""Level background drawn from rasterized chunks of tiles, kept under a memory budget
+
+    python -m src.tilechunks    # benchmark scrolling across a generated 1024x1024 level
+"""
+import pygame
+from collections import OrderedDict
+from src.common import TILE_SIZE, CHUNK_SIZE, load_scaled_texture
+from src.tile import TILE_TABLE
+
+CHUNK_PIXELS = CHUNK_SIZE * TILE_SIZE
+TILE_CHUNK_BUDGET = 12 * 2**20  # Bytes of rasterized chunks a level keeps, about 20 full chunks
+PREFETCH_MARGIN = 4 * TILE_SIZE  # Chunks this close to the view are rasterized ahead, one per frame
+
+class TileChunkCache:
+    """Rasterized CHUNK_SIZE x CHUNK_SIZE blocks of a level's tiles, least recently drawn evicted first"""
+    def __init__(self, level, budget=TILE_CHUNK_BUDGET):
+        self.level = level
+        self.budget = budget
+        self.chunks = OrderedDict()  # chunk index -> Surface
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.textures = [None] * len(TILE_TABLE)  # Scaled texture per tile ID, resolved on first use
+
+    def get_stats(self):
+        """Returns a snapshot of the chunk counters and memory use"""
+        return dict(self.stats, chunks=len(self.chunks), bytes=self.bytes, budget=self.budget)
+
+    def texture(self, tile_id):
+        texture = self.textures[tile_id]
+        if texture is None:
+            texture = load_scaled_texture(TILE_TABLE[tile_id].tile_type.texture_path, (TILE_SIZE, TILE_SIZE))
+            self.textures[tile_id] = texture
+        return texture
+
+    def rasterize(self, chunk_x, chunk_y):
+        """Renders one chunk into a new surface, chunks on the right and bottom edge may be smaller"""
+        level = self.level
+        tile_x, tile_y = chunk_x * CHUNK_SIZE, chunk_y * CHUNK_SIZE
+        width = min(CHUNK_SIZE, level.width - tile_x)
+        height = min(CHUNK_SIZE, level.height - tile_y)
+        surface = pygame.Surface((width * TILE_SIZE, height * TILE_SIZE))
+        surface.fill((0, 0, 0))
+
+        blits = []
+        for y in range(height):
+            row = (tile_y + y) * level.width + tile_x
+            for x, tile_id in enumerate(level.tiles[row:row + width]):
+                if tile_id:
+                    blits.append((self.texture(tile_id), (x * TILE_SIZE, y * TILE_SIZE)))
+        surface.blits(blits, False)
+        return surface
+
+    def get(self, chunk_x, chunk_y):
+        """Returns the chunk's surface, rasterizing it and evicting old chunks if needed"""
+        index = chunk_y * self.level.chunks_x + chunk_x
+        surface = self.chunks.get(index)
+        if surface is not None:
+            self.stats["hits"] += 1
+            self.chunks.move_to_end(index)
+            return surface
+
+        self.stats["misses"] += 1
+        surface = self.rasterize(chunk_x, chunk_y)
+        self.chunks[index] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        # The chunk just added is never the one evicted
+        while self.bytes > self.budget and len(self.chunks) > 1:
+            _, evicted = self.chunks.popitem(last=False)
+            self.bytes -= evicted.get_pitch() * evicted.get_height()
+            self.stats["evictions"] += 1
+        return surface
+
+    def chunk_range(self, left, top, right, bottom):
+        """Chunk columns and rows overlapping the pixel area, clamped to the level"""
+        columns = range(max(0, left // CHUNK_PIXELS), min(self.level.chunks_x, right // CHUNK_PIXELS + 1))
+        rows = range(max(0, top // CHUNK_PIXELS), min(self.level.chunks_y, bottom // CHUNK_PIXELS + 1))
+        return columns, rows
+
+    def draw(self, surface, camera_x, camera_y):
+        """Blits the chunks in view, then rasterizes at most one chunk just outside it"""
+        view_w, view_h = surface.get_size()
+        right, bottom = camera_x + view_w - 1, camera_y + view_h - 1
+
+        columns, rows = self.chunk_range(camera_x, camera_y, right, bottom)
+        surface.blits([(self.get(chunk_x, chunk_y), (chunk_x * CHUNK_PIXELS - camera_x, chunk_y * CHUNK_PIXELS - camera_y))
+                       for chunk_y in rows for chunk_x in columns], False)
+
+        # Get the next chunk ready before the camera scrolls onto it
+        columns, rows = self.chunk_range(camera_x - PREFETCH_MARGIN, camera_y - PREFETCH_MARGIN,
+                                         right + PREFETCH_MARGIN, bottom + PREFETCH_MARGIN)
+        for chunk_y in rows:
+            for chunk_x in columns:
+                if chunk_y * self.level.chunks_x + chunk_x not in self.chunks:
+                    self.get(chunk_x, chunk_y)
+                    return
+
+    def repaint_tile(self, x, y):
+        """Redraws tile x, y in its chunk, if that chunk is rasterized"""
+        surface = self.chunks.get((y // CHUNK_SIZE) * self.level.chunks_x + x // CHUNK_SIZE)
+        if surface is None:
+            return
+        tile_rect = pygame.Rect((x % CHUNK_SIZE) * TILE_SIZE, (y % CHUNK_SIZE) * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        surface.fill((0, 0, 0), tile_rect)
+        tile_id = self.level.tiles[y * self.level.width + x]
+        if tile_id:
+            surface.blit(self.texture(tile_id), tile_rect)
+
+    def clear(self):
+        """Drops every rasterized chunk, they're rendered again when next drawn"""
+        self.chunks.clear()
+        self.bytes = 0
+
+def benchmark(size=1024, frames=2000, view=(256, 240), seed=0):
+    """Scrolls a view diagonally and back across a generated size x size level, timing each draw"""
+    import time
+    from src.mapgen import make_generated_level
+
+    level = make_generated_level(size, size, seed)
+    surface = pygame.Surface(view)
+    cache = level.tile_chunks
+    span_x, span_y = size * TILE_SIZE - view[0], size * TILE_SIZE - view[1]
+
+    start_time = time.perf_counter()
+    for frame in range(frames):
+        # Bounce along the diagonal, moving a few pixels per frame like the camera does
+        position = (frame * 6) % (2 * span_x)
+        position = position if position < span_x else 2 * span_x - position
+        cache.draw(surface, position, position * span_y // span_x)
+    elapsed = time.perf_counter() - start_time
+    return dict(cache.get_stats(), size=size, frames=frames, ms_per_frame=elapsed * 1000 / frames)
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"{result['size']}x{result['size']}: {result['ms_per_frame']:.3f} ms per frame over {result['frames']} frames, "
+          f"{result['chunks']} chunks held ({result['bytes'] / 2**20:.1f} of {result['budget'] / 2**20:.0f} MB), "
+          f"{result['hits']} hits, {result['misses']} misses, {result['evictions']} evictions")